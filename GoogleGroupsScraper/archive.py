@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+SQLite Thread Archive
+
+Stores scraped threads in a normalised SQLite database instead of (or as
+well as) loose JSON files, with an FTS5 full-text index over post content
+so searches don't have to read every thread.
+
+Schema:
+    groups   (id, url)
+    authors  (id, name)
+    threads  (id, thread_id, group_id, url, title, archived_at)
+    posts    (id, thread_id -> threads.id, position, author_id, date, content)
+    posts_fts  FTS5 index over posts.content, kept in sync by triggers
+
+Writes are grouped into one transaction per `batch_size` threads, so an
+archive of millions of posts is built without a commit (and fsync) per post.
+Re-archiving a thread replaces its posts.
+
+Usage:
+    python archive.py <archive.db> "<query>" [--limit N] [--group URL]
+    python archive.py <archive.db> --stats
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from thread_index import canonical_thread_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS threads (
+    id INTEGER PRIMARY KEY,
+    thread_id TEXT NOT NULL UNIQUE,
+    group_id INTEGER REFERENCES groups(id),
+    url TEXT NOT NULL,
+    title TEXT,
+    archived_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    thread_id INTEGER NOT NULL REFERENCES threads(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    author_id INTEGER REFERENCES authors(id),
+    date TEXT,
+    content TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS posts_thread ON posts(thread_id, position);
+CREATE INDEX IF NOT EXISTS posts_author ON posts(author_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    content, content='posts', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+
+class ThreadArchive:
+    def __init__(self, path, batch_size=100):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            batch_size: Threads written per transaction
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.archived = 0
+        self._uncommitted = 0
+        self._author_ids = {}
+        self._group_ids = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        try:
+            self._db.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._db.close()
+            raise ValueError(f"SQLite build without FTS5 support: {e}") from e
+        self._db.execute("PRAGMA foreign_keys = ON")
+        # WAL lets query CLIs read while a scrape is still writing
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+
+    def _lookup_id(self, table, column, value, memo):
+        if value in memo:
+            return memo[value]
+        self._db.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+        row_id = self._db.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+        memo[value] = row_id
+        return row_id
+
+    def contains(self, thread_id):
+        """Return True if the thread ID is already archived"""
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM threads WHERE thread_id = ?", (thread_id,)).fetchone() is not None
+
+    def add_thread(self, thread_content, group_url=None):
+        """
+        Archive one thread, replacing any earlier copy of it
+
+        Args:
+            thread_content: Thread dictionary from extract_thread_content
+            group_url: Group the thread belongs to, if known
+        """
+        url = thread_content["url"]
+        thread_id = canonical_thread_id(url) or url
+        with self._lock:
+            group_id = self._lookup_id("groups", "url", group_url, self._group_ids) if group_url else None
+            self._db.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+            cursor = self._db.execute(
+                "INSERT INTO threads (thread_id, group_id, url, title, archived_at) VALUES (?, ?, ?, ?, ?)",
+                (thread_id, group_id, url, thread_content.get("title"), datetime.now(timezone.utc).isoformat())
+            )
+            thread_row = cursor.lastrowid
+            rows = []
+            for position, post in enumerate(thread_content.get("posts", [])):
+                author = post.get("author")
+                author_id = self._lookup_id("authors", "name", author, self._author_ids) if author else None
+                rows.append((thread_row, position, author_id, post.get("date"), post.get("content", "")))
+            self._db.executemany(
+                "INSERT INTO posts (thread_id, position, author_id, date, content) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.archived += 1
+            self._uncommitted += 1
+            if self._uncommitted >= self.batch_size:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def search(self, query, limit=20, group_url=None):
+        """
+        Full-text search over post content
+
+        Args:
+            query: FTS5 query (words, "phrases", AND/OR/NOT, prefix*)
+            limit: Maximum number of hits
+            group_url: Only search threads from this group
+
+        Returns:
+            list: Hit dictionaries, best match first
+        """
+        sql = """
+            SELECT threads.title, threads.url, authors.name, posts.date, posts.position,
+                   snippet(posts_fts, 0, '[', ']', '...', 12)
+            FROM posts_fts
+            JOIN posts ON posts.id = posts_fts.rowid
+            JOIN threads ON threads.id = posts.thread_id
+            LEFT JOIN authors ON authors.id = posts.author_id
+            LEFT JOIN groups ON groups.id = threads.group_id
+            WHERE posts_fts MATCH ?
+        """
+        params = [query]
+        if group_url:
+            sql += " AND groups.url = ?"
+            params.append(group_url)
+        sql += " ORDER BY bm25(posts_fts) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {"title": title, "url": url, "author": author, "date": date, "post": position + 1, "snippet": snippet}
+            for title, url, author, date, position, snippet in rows
+        ]
+
+    def stats(self):
+        """Return row counts for the archive's tables"""
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("groups", "threads", "posts", "authors")
+            }
+
+    def log_stats(self):
+        if self.archived:
+            logging.info(f"Archived {self.archived} threads to {self.path}")
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search a SQLite thread archive")
+    parser.add_argument("archive", help="Archive database written with --archive")
+    parser.add_argument("query", nargs="?", help='Full-text query, e.g. \'install AND "error message"\'')
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of hits (default: 20)")
+    parser.add_argument("--group", help="Only search threads from this group URL")
+    parser.add_argument("--stats", action="store_true", help="Print the number of archived groups, threads, posts and authors")
+    args = parser.parse_args()
+
+    if not args.query and not args.stats:
+        parser.error("a query or --stats is required")
+
+    archive = ThreadArchive(args.archive)
+    try:
+        if args.stats:
+            for table, count in archive.stats().items():
+                print(f"{table}: {count}")
+        if args.query:
+            start_time = time.monotonic()
+            try:
+                hits = archive.search(args.query, limit=args.limit, group_url=args.group)
+            except sqlite3.OperationalError as e:
+                print(f"Invalid query: {e}", file=sys.stderr)
+                return 1
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            for i, hit in enumerate(hits, 1):
+                print(f"{i}. {hit['title']} (post #{hit['post']})")
+                if hit["author"]:
+                    print(f"   Author: {hit['author']}")
+                if hit["date"]:
+                    print(f"   Date: {hit['date']}")
+                print(f"   Link: {hit['url']}")
+                print(f"   {hit['snippet']}")
+                print()
+            print(f"{len(hits)} hit(s) in {elapsed_ms:.1f} ms")
+    finally:
+        archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,30 @@ This script allows batch extraction of multiple Google Groups threads
 from a list of URLs provided in a text file.
 
 Usage:
-    python batch_extractor.py <input_file> [--cookies cookies.json] [--output output_dir] [--delay seconds]
+    python batch_extractor.py <input_file> [--cookies cookies.json] [--output output_dir] [--rate req_per_sec] [--resume]
 
 Example:
-    python batch_extractor.py thread_urls.txt --cookies google_cookies.json --output threads_data --delay 5
+    python batch_extractor.py thread_urls.txt --cookies google_cookies.json --output threads_data --rate 0.2
 """
 
 import argparse
 import json
 import logging
 import os
+import sqlite3
 import sys
-import time
+from collections import deque
 from pathlib import Path
-from scraper import GoogleGroupsScraper
+from archive import ThreadArchive
+from checkpoint import COMPLETED, FAILED, PENDING, CheckpointManifest
+from sync_state import SyncWatermark
+from connection_pool import log_connection_stats
+from summary_writer import COMPRESSION_CHOICES, StreamingSummaryWriter, summary_filename
+from thread_index import ThreadIndex, canonical_thread_id
+from scraper import (DEFAULT_BASE_URL, GoogleGroupsScraper, add_base_url_argument, add_browser_login_arguments,
+                     add_cache_arguments, add_metrics_argument, add_parser_argument, add_pool_arguments,
+                     add_rate_arguments, browser_login_from_args, cache_from_args, create_parse_pool,
+                     metrics_from_args, rate_limiter_from_args, rebase_url, session_from_args)
 
 # Configure logging
 logging.basicConfig(
@@ -28,10 +38,10 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 
-def extract_group_url(thread_url):
-    """Extract the group URL from a thread URL"""
+def extract_group_url(thread_url, base_url=DEFAULT_BASE_URL):
+    """Extract the group URL from a thread URL on base_url's host"""
     parts = thread_url.split('/c/')
-    if len(parts) < 2 or not parts[0].startswith('https://groups.google.com/g/'):
+    if len(parts) < 2 or not parts[0].startswith(f'{base_url}/g/'):
         return None
     return parts[0]
 
@@ -49,10 +59,28 @@ def main():
     parser.add_argument("input_file", help="Text file containing thread URLs (one per line)")
     parser.add_argument("--cookies", help="Path to JSON file with authentication cookies (for private groups)")
     parser.add_argument("--output", default="threads", help="Directory to save thread content (default: 'threads')")
-    parser.add_argument("--delay", type=int, default=3, help="Delay between requests in seconds (default: 3)")
+    parser.add_argument("--delay", type=float, help="Deprecated: same as --rate 1/DELAY; 0 disables pacing")
     parser.add_argument("--summary", action="store_true", help="Generate a summary JSON file with all threads")
+    parser.add_argument("--summary-compression", choices=COMPRESSION_CHOICES, default="none",
+                        help="Compress the summary file (default: none)")
+    parser.add_argument("--archive", help="SQLite database to archive threads in as well (searchable with archive.py)")
+    parser.add_argument("--resume", action="store_true", help="Skip threads the checkpoint manifest records as completed")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processes to parse thread pages in, 0 to parse inline (default: 0)")
+    parser.add_argument("--manifest", help="Path to the checkpoint manifest (default: <output>/manifest.jsonl)")
+    parser.add_argument("--sync-state", help="Sync state written by generate_url_list.py --sync-state; threads saved "
+                                             "by this run are recorded as synced, failed ones are listed again next time")
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    # A third of the shared default: batches run unattended over many threads
+    add_rate_arguments(parser, default_rate=1 / 3)
+    add_pool_arguments(parser)
+    add_metrics_argument(parser)
+    add_base_url_argument(parser)
+    add_browser_login_arguments(parser)
     
     args = parser.parse_args()
+    if args.delay is not None:
+        args.rate = 1.0 / args.delay if args.delay > 0 else 0
     
     # Validate input file
     if not os.path.exists(args.input_file):
@@ -67,6 +95,8 @@ def main():
     try:
         with open(args.input_file, 'r') as f:
             thread_urls = [line.strip() for line in f if line.strip() and line.strip().startswith('http')]
+        if args.base_url:
+            thread_urls = [rebase_url(url, args.base_url) for url in thread_urls]
     except Exception as e:
         logging.error(f"Failed to read input file: {e}")
         return 1
@@ -77,79 +107,196 @@ def main():
     
     logging.info(f"Found {len(thread_urls)} thread URLs to process")
     
-    # Group URLs by Google Group to minimize scraper initialization
+    # Group URLs by Google Group to minimize scraper initialization,
+    # dropping URLs that point at a thread already queued (in any group)
     groups = {}
+    thread_index = ThreadIndex()
     for url in thread_urls:
-        group_url = extract_group_url(url)
+        group_url = extract_group_url(url, base_url=(args.base_url or DEFAULT_BASE_URL).rstrip('/'))
         if group_url:
+            if not thread_index.add(url):
+                continue
             if group_url not in groups:
                 groups[group_url] = []
             groups[group_url].append(url)
         else:
             logging.warning(f"Invalid thread URL format, skipping: {url}")
     
-    # Summary data
-    all_threads = []
+    # Record every thread we haven't seen before as pending
+    manifest = CheckpointManifest(args.manifest or output_dir / "manifest.jsonl")
+    for urls in groups.values():
+        for url in urls:
+            thread_id = canonical_thread_id(url)
+            if manifest.status(thread_id) is None:
+                manifest.mark(thread_id, url, PENDING)
+    
+    if args.resume:
+        counts = manifest.counts()
+        logging.info(f"Resuming: {counts[COMPLETED]} completed, {counts[FAILED]} failed, {counts[PENDING]} pending")
+    
+    # Summary is streamed to disk as threads complete, so memory doesn't grow with the batch
+    summary = None
+    if args.summary:
+        summary_path = output_dir / summary_filename(args.summary_compression)
+        try:
+            summary = StreamingSummaryWriter(summary_path, compression=args.summary_compression)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to create summary: {e}")
+            return 1
+    
+    archive = None
+    if args.archive:
+        try:
+            archive = ThreadArchive(args.archive)
+        except (sqlite3.Error, ValueError) as e:
+            logging.error(f"Failed to open archive {args.archive}: {e}")
+            return 1
+    skipped = 0
+    
+    # One cache, rate limiter, connection pool and metrics recorder shared by every group's scraper
+    cache = cache_from_args(args)
+    rate_limiter = rate_limiter_from_args(args)
+    session = session_from_args(args)
+    metrics = metrics_from_args(args)
+    
+    # Cookies live on the shared session, so they only need loading once
+    if args.cookies:
+        if not GoogleGroupsScraper(None, session=session).authenticate_with_cookies(args.cookies):
+            logging.error("Failed to authenticate with provided cookies. Exiting.")
+            return 1
+    
+    # Sign in with the browser once; every group's scraper re-logs in through it if the session expires
+    browser_login = browser_login_from_args(args)
+    if browser_login and not browser_login.login(session):
+        logging.error("Browser login failed. Exiting.")
+        return 1
+    
+    parse_pool = (create_parse_pool(args.parse_workers, args.parser)
+                  if args.parse_workers > 0 else None)
+    
+    def save_thread(thread_id, thread_url, group_url, future):
+        """Wait for a thread's parsed content, then save it and record the result"""
+        try:
+            thread_content = future.result()
+        except Exception as e:
+            logging.error(f"Failed to parse thread {thread_url}: {e}")
+            thread_content = None
+        
+        if not thread_content:
+            logging.error(f"Failed to extract content from thread: {thread_url}")
+            manifest.mark(thread_id, thread_url, FAILED, error="extraction failed")
+            return
+        
+        logging.info(f"Successfully extracted: {thread_content['title']} ({len(thread_content['posts'])} posts)")
+        
+        # Add to summary
+        if summary:
+            summary.add(thread_content)
+        
+        if archive:
+            archive.add_thread(thread_content, group_url=group_url)
+        
+        # Save to file
+        filename = f"{sanitize_filename(thread_content['title'])}_{thread_id}.json"
+        output_path = output_dir / filename
+        
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(thread_content, f, indent=2, ensure_ascii=False)
+            logging.info(f"Saved to {output_path}")
+            manifest.mark(thread_id, thread_url, COMPLETED, file=str(output_path))
+        except Exception as e:
+            logging.error(f"Failed to save thread content: {e}")
+            manifest.mark(thread_id, thread_url, FAILED, error=f"save failed: {e}")
     
     # Process each group
     for group_url, urls in groups.items():
         logging.info(f"Processing group: {group_url} ({len(urls)} threads)")
         
-        # Initialize scraper for this group
-        scraper = GoogleGroupsScraper(group_url)
+        # Threads saved for this group are confirmed into its sync watermark
+        watermark = SyncWatermark(args.sync_state, group_url) if args.sync_state else None
         
-        # Authenticate with cookies if provided
-        if args.cookies:
-            if not scraper.authenticate_with_cookies(args.cookies):
-                logging.error(f"Failed to authenticate with provided cookies for {group_url}. Skipping group.")
-                continue
+        # Initialize scraper for this group
+        scraper = GoogleGroupsScraper(group_url, cache=cache, parser=args.parser,
+                                      selector_cache=args.selector_cache, rate_limiter=rate_limiter,
+                                      session=session, parse_workers=args.parse_workers, parse_pool=parse_pool,
+                                      metrics=metrics,
+                                      reauthenticate=browser_login.refresh if browser_login else None)
         
         # Process each thread in this group
+        pending = deque()
         for i, thread_url in enumerate(urls, 1):
-            thread_id = thread_url.split('/')[-1]
-            logging.info(f"Processing thread {i}/{len(urls)}: {thread_url}")
-            
-            # Extract thread content
-            thread_content = scraper.extract_thread_content(thread_url)
-            
-            if not thread_content:
-                logging.error(f"Failed to extract content from thread: {thread_url}")
-                continue
-            
-            logging.info(f"Successfully extracted: {thread_content['title']} ({len(thread_content['posts'])} posts)")
-            
-            # Add to summary
-            if args.summary:
-                all_threads.append(thread_content)
+            thread_id = canonical_thread_id(thread_url)
             
-            # Save to file
-            filename = f"{sanitize_filename(thread_content['title'])}_{thread_id}.json"
-            output_path = output_dir / filename
+            if args.resume and manifest.status(thread_id) == COMPLETED:
+                saved_path = manifest.entries[thread_id].get("file")
+                needs_archive = archive and not archive.contains(thread_id)
+                try:
+                    if not saved_path or not os.path.exists(saved_path):
+                        raise FileNotFoundError(f"saved file {saved_path} is missing")
+                    thread_content = None
+                    if summary or needs_archive:
+                        # Reuse the file saved by the earlier run
+                        with open(saved_path, 'r', encoding='utf-8') as f:
+                            thread_content = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Fetch it again rather than losing it from the output for good
+                    logging.warning(f"Could not load saved thread {thread_id} ({e}); fetching it again")
+                    manifest.mark(thread_id, thread_url, PENDING)
+                else:
+                    skipped += 1
+                    if watermark:
+                        watermark.confirm(thread_url)
+                    if summary:
+                        summary.add(thread_content)
+                    if needs_archive:
+                        archive.add_thread(thread_content, group_url=group_url)
+                    continue
             
-            try:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(thread_content, f, indent=2, ensure_ascii=False)
-                logging.info(f"Saved to {output_path}")
-            except Exception as e:
-                logging.error(f"Failed to save thread content: {e}")
+            logging.info(f"Processing thread {i}/{len(urls)}: {thread_url}")
             
-            # Delay between requests to be nice to the server
-            if i < len(urls):
-                logging.info(f"Waiting {args.delay} seconds before next request...")
-                time.sleep(args.delay)
-    
-    # Save summary if requested
-    if args.summary and all_threads:
-        summary_path = output_dir / "summary.json"
-        try:
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "thread_count": len(all_threads),
-                    "threads": all_threads
-                }, f, indent=2, ensure_ascii=False)
-            logging.info(f"Saved summary to {summary_path}")
-        except Exception as e:
-            logging.error(f"Failed to save summary: {e}")
+            # Extract thread content; with --parse-workers, parsing overlaps the next fetch
+            pending.append((thread_id, thread_url, group_url, scraper.submit_thread_content(thread_url)))
+            while len(pending) > args.parse_workers:
+                save_thread(*pending.popleft())
+        
+        while pending:
+            save_thread(*pending.popleft())
+        
+        if watermark:
+            for thread_url in urls:
+                if manifest.status(canonical_thread_id(thread_url)) == COMPLETED:
+                    watermark.confirm(thread_url)
+            watermark.save()
+        
+        scraper.selector_memo.log_stats()
+        scraper.selector_memo.save()
+    
+    if summary:
+        summary.close()
+        logging.info(f"Saved summary of {summary.thread_count} threads to {summary_path}")
+    
+    if archive:
+        archive.log_stats()
+        archive.close()
+    
+    if parse_pool:
+        parse_pool.shutdown()
+    thread_index.log_stats()
+    rate_limiter.log_stats()
+    log_connection_stats(session)
+    if cache:
+        cache.log_stats()
+        cache.close()
+    if metrics:
+        metrics.log_stats()
+        metrics.save()
+    
+    counts = manifest.counts()
+    manifest.close()
+    if skipped:
+        logging.info(f"Skipped {skipped} threads already completed in an earlier run")
+    logging.info(f"Checkpoint: {counts[COMPLETED]} completed, {counts[FAILED]} failed, {counts[PENDING]} pending")
     
     logging.info(f"Batch extraction complete. Processed {len(thread_urls)} threads.")
     return 0
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Offline Parsing Benchmark
+
+Measures how fast the scraper's extraction methods run over a corpus of
+saved HTML pages, for every installed parser backend, without touching the
+network. Listing pages go through extract_listing (the partial-tree parse a
+crawl uses, or with --listing-parse full, a full-document parse followed by
+the same selectors), thread pages through parse_thread_content (the parsing
+half of extract_thread_content).
+
+Fixtures are the *.html files in the fixtures directory; the file name
+prefix says what they are:
+
+    listing_*.html   Group listing pages
+    thread_*.html    Thread pages
+
+If the directory holds no fixtures, a deterministic synthetic corpus is
+generated: listing pages plus 5-post and 500-post threads, in both the old
+and new layouts, and the listings again inside page_source.html's real
+markup (listing_chrome_*.html). Real saved pages can be added alongside.
+
+Two memory figures are reported per page. "heap KB" is the peak of the
+Python allocator (tracemalloc) during one extraction; it doesn't see the C
+heaps of lxml and selectolax, so it only compares runs of one backend.
+"RSS KB" is the peak resident set size of a fresh subprocess that extracts
+the page once, minus that of one that only loads it; it counts every
+allocator, so it is comparable across backends (not available on Windows).
+
+Results can be saved as a baseline; later runs exit with status 1 if any
+page throughput drops more than --threshold below it. Baselines are only
+comparable on the same machine.
+
+Usage:
+    python benchmark.py [--fixtures DIR] [--parsers NAME ...] [--baseline FILE] [--save-baseline]
+
+Example:
+    python benchmark.py --save-baseline
+    python benchmark.py --threshold 0.15
+    python benchmark.py --listing-parse full --output full.json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; RSS is then not measured
+    resource = None
+
+from parsers import available_backends, make_soup
+from scraper import GoogleGroupsScraper
+from synthetic_pages import LAYOUTS, in_chrome, listing_page, thread_page
+
+FIXTURE_GROUP = "/g/benchmark"
+
+# Default fixture directory and baseline, next to this script (both git-ignored)
+DEFAULT_FIXTURES = Path(__file__).with_name("benchmark_fixtures")
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+# Saved real page whose head, inline CSS and scripts wrap the listing_chrome_* fixtures
+CHROME_PAGE = Path(__file__).with_name("page_source.html")
+
+
+def generate_fixtures(fixtures_dir):
+    """Write the synthetic fixture corpus into fixtures_dir"""
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    chrome = CHROME_PAGE.read_text(encoding="utf-8") if CHROME_PAGE.exists() else None
+    for layout in LAYOUTS:
+        thread_ids = [f"{layout}{i:04d}" for i in range(100)]
+        listing = listing_page(FIXTURE_GROUP, thread_ids, f"{FIXTURE_GROUP}?page=2", layout)
+        pages = {
+            f"listing_{layout}.html": listing,
+            f"thread_small_{layout}.html": thread_page(f"small-{layout}", 5, layout),
+            f"thread_large_{layout}.html": thread_page(f"large-{layout}", 500, layout),
+        }
+        if chrome:
+            pages[f"listing_chrome_{layout}.html"] = in_chrome(listing, chrome)
+        for name, page in pages.items():
+            (fixtures_dir / name).write_text(page, encoding="utf-8")
+    logging.warning(f"Generated synthetic fixtures in {fixtures_dir}")
+
+
+def load_fixtures(fixtures_dir):
+    """
+    Load fixtures from a directory, generating the synthetic corpus if it is empty
+
+    Returns:
+        list: (name, kind, html) tuples, kind is "listing" or "thread"
+    """
+    fixtures_dir = Path(fixtures_dir)
+    if not fixtures_dir.exists() or not any(fixtures_dir.glob("*.html")):
+        generate_fixtures(fixtures_dir)
+
+    fixtures = []
+    for path in sorted(fixtures_dir.glob("*.html")):
+        kind = path.name.split("_", 1)[0]
+        if kind not in ("listing", "thread"):
+            logging.warning(f"Skipping {path.name}: fixture names must start with listing_ or thread_")
+            continue
+        fixtures.append((path.stem, kind, path.read_text(encoding="utf-8")))
+    return fixtures
+
+
+def run_once(scraper, kind, html, page_url, listing_parse="strained"):
+    """Extract one page and return the number of items found (threads or posts)"""
+    if kind == "listing":
+        if listing_parse == "full":
+            soup = make_soup(html, scraper.parser)
+            threads = scraper.extract_thread_info(soup)
+            scraper.extract_next_page(soup)
+        else:
+            threads, _ = scraper.extract_listing(html, page_url)
+        return len(threads)
+    return len(scraper.parse_thread_content(html, page_url)["posts"])
+
+
+def benchmark_fixture(parser, kind, html, min_time=1.0, min_runs=3, listing_parse="strained"):
+    """
+    Time extraction of one page with one parser backend
+
+    Args:
+        parser: Parser backend name
+        kind: "listing" or "thread"
+        html: Page HTML
+        min_time: Keep repeating until this many seconds have been spent
+        min_runs: Minimum number of timed runs
+        listing_parse: "strained" (extract_listing) or "full" (whole-document parse) for listing pages
+
+    Returns:
+        dict: pages_per_sec, items (threads or posts per page), items_per_sec,
+            peak_kb (Python heap), peak_rss_kb (None if unavailable), runs
+    """
+    page_url = f"https://groups.google.com{FIXTURE_GROUP}/c/fixture"
+    scraper = GoogleGroupsScraper(None, parser=parser)
+
+    # Warm-up run, which also lets the selector memo learn the layout like a real crawl would
+    items = run_once(scraper, kind, html, page_url, listing_parse)
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        run_once(scraper, kind, html, page_url, listing_parse)
+        timings.append(time.perf_counter() - start)
+
+    # Python heap peak is measured on a separate run; tracemalloc slows everything down
+    tracemalloc.start()
+    run_once(scraper, kind, html, page_url, listing_parse)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    return {
+        "pages_per_sec": 1.0 / seconds,
+        "items": items,
+        "items_per_sec": items / seconds,
+        "peak_kb": peak / 1024,
+        "peak_rss_kb": measure_peak_rss(parser, kind, html, listing_parse),
+        "runs": len(timings),
+    }
+
+
+def _max_rss_kb():
+    # Linux carries the parent's peak over into ru_maxrss across exec; VmHWM is this process's own
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return usage / 1024 if sys.platform == "darwin" else usage
+
+
+def _probe_peak_rss(parser, kind, html, listing_parse):
+    command = [sys.executable, __file__, "--rss-probe", parser, kind, listing_parse]
+    probe = subprocess.run(command, input=html, capture_output=True, text=True, encoding="utf-8")
+    if probe.returncode != 0:
+        logging.warning(f"RSS probe failed for {parser}/{kind}: {probe.stderr.strip()[-300:]}")
+        return None
+    return json.loads(probe.stdout.strip().splitlines()[-1])["max_rss_kb"]
+
+
+def measure_peak_rss(parser, kind, html, listing_parse="strained"):
+    """
+    Measure the peak RSS one extraction adds, in fresh subprocesses
+
+    Unlike tracemalloc this counts the C heaps of lxml and selectolax. A
+    control process loads the same modules and page without extracting it.
+
+    Returns:
+        float: Peak RSS increase in KB, or None if it can't be measured here
+    """
+    if resource is None:
+        return None
+    control = _probe_peak_rss(parser, "none", html, listing_parse)
+    measured = _probe_peak_rss(parser, kind, html, listing_parse)
+    if control is None or measured is None:
+        return None
+    return max(0, measured - control)
+
+
+def rss_probe(parser, kind, listing_parse):
+    """Subprocess side of measure_peak_rss: extract the page on stdin once (unless kind is "none")"""
+    # Logging goes to stdout, which carries the result
+    logging.disable(logging.CRITICAL)
+    html = sys.stdin.read()
+    page_url = f"https://groups.google.com{FIXTURE_GROUP}/c/fixture"
+    scraper = GoogleGroupsScraper(None, parser=parser)
+    if kind != "none":
+        run_once(scraper, kind, html, page_url, listing_parse)
+    print(json.dumps({"max_rss_kb": _max_rss_kb()}))
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare results against a baseline
+
+    Returns:
+        list: (key, baseline pages/sec, current pages/sec) for every regression
+    """
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key, {}).get("pages_per_sec")
+        if expected and result["pages_per_sec"] < expected * (1 - threshold):
+            regressions.append((key, expected, result["pages_per_sec"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper's extraction methods on saved pages")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES,
+                        help="Directory of fixture pages (default: benchmark_fixtures next to this script)")
+    parser.add_argument("--parsers", nargs="+", help="Parser backends to benchmark (default: all installed)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to spend timing each page (default: 1.0)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline results file (default: benchmark_baseline.json next to this script)")
+    parser.add_argument("--save-baseline", action="store_true", help="Save this run's results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Fail if pages/sec falls more than this fraction below the baseline (default: 0.2)")
+    parser.add_argument("--listing-parse", choices=["strained", "full"], default="strained",
+                        help="Parse listing pages body-only like a crawl does, or whole (default: strained)")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    parser.add_argument("--rss-probe", nargs=3, metavar=("PARSER", "KIND", "LISTING_PARSE"), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.rss_probe:
+        rss_probe(*args.rss_probe)
+        return 0
+
+    # The extraction methods log every selector match; only show problems
+    logging.getLogger().setLevel(logging.WARNING)
+
+    installed = available_backends()
+    backends = args.parsers or installed
+    missing = [backend for backend in backends if backend not in installed]
+    if missing:
+        logging.error(f"Parser backends not installed: {', '.join(missing)}")
+        return 1
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        logging.error(f"No fixtures found in {args.fixtures}")
+        return 1
+
+    results = {}
+    print(f"{'parser':<12} {'fixture':<22} {'pages/s':>10} {'items':>6} {'items/s':>10} {'heap KB':>9} {'RSS KB':>9}")
+    for backend in backends:
+        for name, kind, html in fixtures:
+            result = benchmark_fixture(backend, kind, html, min_time=args.min_time,
+                                       listing_parse=args.listing_parse)
+            results[f"{backend}/{name}"] = result
+            unit = "threads" if kind == "listing" else "posts"
+            rss = "n/a" if result["peak_rss_kb"] is None else f"{result['peak_rss_kb']:.0f}"
+            print(f"{backend:<12} {name:<22} {result['pages_per_sec']:>10.1f} {result['items']:>6} "
+                  f"{result['items_per_sec']:>10.0f} {result['peak_kb']:>9.0f} {rss:>9}  ({unit})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nThroughput regressed more than {args.threshold:.0%} below {args.baseline}:")
+        for key, expected, actual in regressions:
+            print(f"  {key}: {expected:.1f} -> {actual:.1f} pages/s ({actual / expected - 1:+.0%})")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Browser Topic Extraction Benchmark
+
+Compares two ways of reading topics out of a rendered group page:
+
+    per-element  The original scrape_topics loop: an element handle per topic,
+                 then query_selector/inner_text/get_attribute calls for its
+                 title, URL, author and date, each a round trip to the browser
+    batched      scrape_topics' single eval_on_selector_all call, which reads
+                 every topic inside the page and returns them as one payload
+
+Synthetic listing pages (synthetic_pages.py, new layout) are loaded with
+set_content, so no network is involved. The benchmark reports browser round
+trips and wall time per page for each approach, and checks that both return
+identical topics.
+
+Requires Playwright and a browser (playwright install chromium).
+
+Usage:
+    python browser_benchmark.py [--topics 50 500] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    print("Error: Playwright is required for this script.")
+    print("Install it with: pip install playwright")
+    print("Then run: playwright install")
+    sys.exit(1)
+
+from browser_scraper import EXTRACT_TOPICS_JS, topic_from_record
+from synthetic_pages import listing_page
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+TOPIC_SELECTOR = "a[href*='/c/']"
+
+
+async def extract_per_element(page, max_topics):
+    """
+    Extract topics with the original one-call-per-field loop
+
+    Returns:
+        tuple: (topics, browser round trips)
+    """
+    round_trips = 1
+    elements = await page.query_selector_all(TOPIC_SELECTOR)
+    topics = []
+
+    async def first(element, *selectors):
+        nonlocal round_trips
+        for selector in selectors:
+            round_trips += 1
+            found = await element.query_selector(selector)
+            if found:
+                return found
+        return None
+
+    for element in elements[:max_topics]:
+        topic = {}
+        title_element = await first(element, "h3", "span") or element
+        round_trips += 2
+        topic["title"] = await title_element.inner_text()
+        href = await element.get_attribute("href")
+        if href:
+            topic["url"] = f"https://groups.google.com{href}" if href.startswith("/") else href
+        for field, selectors in (("author", ("span[role='author']", ".bZI0O")),
+                                 ("date", ("span[role='date']", ".wJMDsd"))):
+            found = await first(element, *selectors)
+            if found:
+                round_trips += 1
+                topic[field] = await found.inner_text()
+        topics.append(topic)
+    return topics, round_trips
+
+
+async def extract_batched(page, max_topics):
+    """
+    Extract topics the way scrape_topics does
+
+    Returns:
+        tuple: (topics, browser round trips)
+    """
+    records = await page.eval_on_selector_all(TOPIC_SELECTOR, EXTRACT_TOPICS_JS, max_topics)
+    return [topic_from_record(record) for record in records], 1
+
+
+async def time_extraction(page, extract, max_topics, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        topics, round_trips = await extract(page, max_topics)
+        timings.append(time.perf_counter() - start)
+    return topics, round_trips, statistics.median(timings)
+
+
+async def run(topic_counts, repeat):
+    failed = False
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        print(f"{'topics':>7} {'approach':<12} {'round trips':>12} {'ms/page':>9}")
+        for count in topic_counts:
+            thread_ids = [f"t{i:07d}" for i in range(count)]
+            await page.set_content(listing_page("/g/benchmark", thread_ids, layout="new"))
+
+            legacy, legacy_trips, legacy_time = await time_extraction(page, extract_per_element, count, repeat)
+            batched, batched_trips, batched_time = await time_extraction(page, extract_batched, count, repeat)
+            print(f"{count:>7} {'per-element':<12} {legacy_trips:>12} {legacy_time * 1000:>9.1f}")
+            print(f"{count:>7} {'batched':<12} {batched_trips:>12} {batched_time * 1000:>9.1f}"
+                  f"  ({legacy_time / batched_time:.0f}x faster)")
+            if legacy != batched:
+                failed = True
+                logging.error(f"Batched extraction returned different topics for {count} topics")
+        await browser.close()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-element and batched topic extraction in a real browser")
+    parser.add_argument("--topics", type=int, nargs="+", default=[50, 500], help="Topics per page (default: 50 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per approach (default: 5)")
+
+    args = parser.parse_args()
+    return asyncio.run(run(args.topics, args.repeat))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Long-lived Browser for the Browser Scraper
+
+Launches Chromium once, with a persistent profile and a DevTools port, signs
+in to Google and keeps running. browser_scraper.py runs started with
+--cdp attach to it, so they skip the browser launch, the sign-in check
+and cold caches; each run opens and closes only its own pages.
+
+Stop the daemon with Ctrl-C.
+
+Usage:
+    python browser_daemon.py [--user-data-dir DIR] [--port 9222] [--visible]
+
+Example:
+    python browser_daemon.py --user-data-dir browser_profile --visible
+    python browser_scraper.py groupname@googlegroups.com --cdp http://127.0.0.1:9222 --startup-log startup.jsonl
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from browser_scraper import GoogleGroupsBrowserScraper, record_startup
+
+
+async def run(args):
+    browser = GoogleGroupsBrowserScraper(
+        headless=not args.visible,
+        slow_mo=0,
+        user_data_dir=args.user_data_dir,
+        debug_port=args.port
+    )
+    try:
+        await browser.start()
+        if not args.no_login:
+            await browser.login(args.email, args.password, args.cookies)
+        record_startup(None, browser.startup)
+        logging.info(f"Browser ready; attach with: python browser_scraper.py <group> --cdp http://127.0.0.1:{args.port}")
+        # Serve until interrupted
+        await asyncio.Event().wait()
+    finally:
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep a signed-in browser running for browser_scraper.py --cdp")
+    parser.add_argument("--user-data-dir", default="browser_profile",
+                        help="Browser profile directory, kept between runs (default: browser_profile)")
+    parser.add_argument("--port", type=int, default=9222, help="DevTools port scrapers attach to (default: 9222)")
+    parser.add_argument("--email", help="Google account email (if not provided, will use GOOGLE_EMAIL environment variable)")
+    parser.add_argument("--password", help="Google account password (if not provided, will use GOOGLE_PASSWORD environment variable)")
+    parser.add_argument("--cookies", default="cookies/google_cookies.json",
+                        help="Path to save/load cookies (default: cookies/google_cookies.json)")
+    parser.add_argument("--no-login", action="store_true", help="Start without signing in (public groups only)")
+    parser.add_argument("--visible", action="store_true", help="Show the browser window (needed for manual sign-in)")
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        logging.info("Browser daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
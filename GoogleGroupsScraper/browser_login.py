@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Browser Login for the HTTP Scraper
+
+Signing in to Google needs a real browser, but fetching pages through one is
+10-50x slower than GoogleGroupsScraper's plain HTTP requests. BrowserLogin
+signs in with browser_scraper.py's Playwright login, copies the live cookies
+straight into a requests session and closes the browser, so the rest of the
+run is plain HTTP.
+
+If the HTTP side is later redirected to the sign-in page (the session
+expired), get_page calls BrowserLogin.refresh, which signs in again without
+the saved cookie file (those cookies just failed) and replaces the session's
+cookies; concurrent workers that hit the redirect at the same time share a
+single re-login. A login that leaves the browser without Google session
+cookies counts as failed.
+
+Cookies can be given in either format the scrapers save:
+    {"SID": "...", ...}                                      (cookie_helper.py)
+    [{"name": "SID", "value": "...", "domain": ".google.com", ...}, ...]   (Playwright)
+
+Playwright is only imported when a login actually runs.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+LOGIN_HOSTS = ("accounts.google.com",)
+
+
+def set_session_cookies(session, cookies):
+    """
+    Load cookies into a requests session
+
+    Args:
+        session: requests.Session to update
+        cookies: Name -> value dict (set for .google.com) or a Playwright cookie list
+
+    Returns:
+        int: Number of cookies set
+    """
+    if isinstance(cookies, dict):
+        for name, value in cookies.items():
+            session.cookies.set(name, value, domain='.google.com')
+        return len(cookies)
+
+    for cookie in cookies:
+        expires = cookie.get("expires")
+        session.cookies.set(
+            cookie["name"], cookie["value"],
+            domain=cookie.get("domain", ".google.com"),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+            # Playwright marks session cookies with -1
+            expires=int(expires) if expires and expires > 0 else None,
+            rest={"HttpOnly": None} if cookie.get("httpOnly") else {},
+        )
+    return len(cookies)
+
+
+def is_login_redirect(response):
+    """Return True if a response ended up on the Google sign-in page"""
+    return urlparse(response.url).hostname in LOGIN_HOSTS
+
+
+class BrowserLogin:
+    def __init__(self, email=None, password=None, cookies_path=None, headless=True, min_interval=60.0):
+        """
+        Args:
+            email: Google account email (default: GOOGLE_EMAIL environment variable)
+            password: Google account password (default: GOOGLE_PASSWORD environment variable)
+            cookies_path: Playwright cookie file to try first and update after signing in (None to skip)
+            headless: Run the browser without a window; manual sign-in needs a visible one
+            min_interval: Seconds after a login during which further refresh requests reuse its cookies
+        """
+        self.email = email
+        self.password = password
+        self.cookies_path = cookies_path
+        self.headless = headless
+        self.min_interval = min_interval
+        self.logins = 0
+        self._last_login = None
+        self._lock = threading.Lock()
+
+    async def _browser_cookies(self, load_cookies=True):
+        # Deferred so the HTTP scrapers don't need Playwright unless they log in
+        from browser_scraper import GoogleGroupsBrowserScraper
+
+        browser = GoogleGroupsBrowserScraper(headless=self.headless, slow_mo=0)
+        try:
+            await browser.start()
+            await browser.login(self.email, self.password, self.cookies_path, load_cookies=load_cookies)
+            if not await browser.has_session_cookies():
+                raise RuntimeError("the browser holds no Google session cookies after signing in")
+            return await browser.context.cookies()
+        finally:
+            await browser.close()
+
+    def login(self, session, load_cookies=True):
+        """
+        Sign in with the browser and load its cookies into session
+
+        Args:
+            session: requests.Session to load the cookies into
+            load_cookies: Try the saved cookie file before signing in
+
+        Returns:
+            bool: True if cookies were loaded
+        """
+        start_time = time.monotonic()
+        try:
+            cookies = asyncio.run(self._browser_cookies(load_cookies))
+        except Exception as e:
+            logging.error(f"Browser login failed: {e}")
+            return False
+        self.logins += 1
+        self._last_login = time.monotonic()
+        count = set_session_cookies(session, cookies)
+        logging.info(f"Browser login took {self._last_login - start_time:.1f}s; "
+                     f"handed {count} cookies to the HTTP scraper")
+        return count > 0
+
+    def refresh(self, session):
+        """
+        Sign in again after the HTTP scraper was sent to the sign-in page
+
+        Callers that arrive while (or shortly after) another thread re-logged in
+        get that login's cookies instead of opening another browser.
+
+        Returns:
+            bool: True if the session has fresh cookies to retry with
+        """
+        requested = time.monotonic()
+        with self._lock:
+            if self._last_login is not None and requested - self._last_login < self.min_interval:
+                return True
+            logging.warning("Redirected to the Google sign-in page; logging in again with the browser")
+            # The saved cookies are the ones that just expired, so sign in from scratch
+            return self.login(session, load_cookies=False)
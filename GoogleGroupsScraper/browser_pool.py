@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Browser Page Pool
+
+Lets the browser scraper visit several groups and topic pages at once. The
+pool hands out up to `size` Playwright pages, all opened in one browser
+context, so they share the logged-in cookies and the HTTP cache. Callers
+wait in a first-come queue when every page is busy.
+
+Long-lived tabs leak memory as Google's single-page app accumulates state,
+so a page is closed and replaced with a fresh one after `max_navigations`
+navigations, when its JS heap grows past `max_heap_mb`, or when its
+renderer crashes.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+# Chromium-only; other engines report 0 and are recycled by navigation count alone
+_HEAP_SIZE_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class _PooledPage:
+    def __init__(self, page):
+        self.page = page
+        self.navigations = 0
+        self.crashed = False
+        page.on("framenavigated", self._on_navigated)
+        page.on("crash", self._on_crash)
+
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.navigations += 1
+
+    def _on_crash(self, page):
+        self.crashed = True
+
+
+class PagePool:
+    def __init__(self, context, size=4, max_navigations=50, max_heap_mb=None):
+        """
+        Args:
+            context: Playwright BrowserContext the pages are opened in
+            size: Maximum number of pages open at once
+            max_navigations: Replace a page after this many navigations (0 never recycles)
+            max_heap_mb: Replace a page whose JS heap exceeds this many MB (None for no limit)
+        """
+        self.context = context
+        self.size = max(1, size)
+        self.max_navigations = max_navigations
+        self.max_heap_mb = max_heap_mb
+        self._idle = asyncio.Queue()
+        self._opened = 0
+        self._lock = asyncio.Lock()
+        self.stats = {"uses": 0, "opened": 0, "recycled": 0, "crashed": 0}
+
+    async def _acquire(self):
+        # Claim a new slot while under the size limit, otherwise wait for one to be released.
+        # A slot is a _PooledPage, or None if it has no page yet (new, or its page was recycled).
+        async with self._lock:
+            if self._idle.empty() and self._opened < self.size:
+                self._opened += 1
+                return None
+        return await self._idle.get()
+
+    async def _should_recycle(self, pooled):
+        if pooled.crashed or pooled.page.is_closed():
+            self.stats["crashed"] += 1
+            return True
+        if self.max_navigations and pooled.navigations >= self.max_navigations:
+            return True
+        if self.max_heap_mb:
+            try:
+                heap = await pooled.page.evaluate(_HEAP_SIZE_JS)
+            except Exception:
+                return True
+            if heap > self.max_heap_mb * 1024 * 1024:
+                logging.debug(f"Recycling page with a {heap / (1024 * 1024):.0f} MB JS heap")
+                return True
+        return False
+
+    async def _release(self, pooled):
+        if await self._should_recycle(pooled):
+            self.stats["recycled"] += 1
+            try:
+                await pooled.page.close()
+            except Exception:
+                pass
+            pooled = None
+        self._idle.put_nowait(pooled)
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow a page for the duration of an `async with` block
+
+        Yields:
+            A Playwright Page sharing the pool's browser context
+        """
+        pooled = await self._acquire()
+        if pooled is None:
+            try:
+                pooled = _PooledPage(await self.context.new_page())
+            except Exception:
+                self._idle.put_nowait(None)
+                raise
+            self.stats["opened"] += 1
+        self.stats["uses"] += 1
+        try:
+            yield pooled.page
+        finally:
+            await self._release(pooled)
+
+    async def map(self, func, items):
+        """
+        Run func(page, item) for every item, as many at once as the pool has pages
+
+        Args:
+            func: Coroutine function taking a page and an item
+            items: Work items
+
+        Returns:
+            list: Results in the order of items; an item whose call raised gets None
+        """
+        async def run(item):
+            async with self.page() as page:
+                try:
+                    return await func(page, item)
+                except Exception as e:
+                    logging.error(f"Error processing {item}: {e}")
+                    return None
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def close(self):
+        """Close every idle page"""
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            self._opened -= 1
+            if pooled is not None:
+                try:
+                    await pooled.page.close()
+                except Exception:
+                    pass
+
+    def log_stats(self):
+        if self.stats["uses"]:
+            logging.info(
+                f"Page pool: {self.stats['uses']} page uses on {self.stats['opened']} pages opened "
+                f"(max {self.size} at once), {self.stats['recycled']} recycled, {self.stats['crashed']} crashed"
+            )
@@ -5,6 +5,21 @@ Google Groups Browser Scraper
 This script uses Playwright to automate browser actions for scraping Google Groups.
 It supports interactive login and can extract data from private groups.
 
+Several groups, and the topic pages within them, can be scraped at once
+through a pool of pages that share the logged-in browser context (see
+browser_pool.py).
+
+With --block-resources, images, fonts, stylesheets, media and analytics
+beacons are aborted on group and topic pages (see resource_filter.py), and
+--nav-stats records the requests, bytes and load time of every navigation.
+
+Startup can be made warm: --user-data-dir keeps the browser profile
+(cookies, cache, service workers) between runs, and --cdp attaches to a
+long-lived browser started by browser_daemon.py instead of launching one.
+In both modes a profile that still holds Google session cookies skips the
+sign-in check. Launch and login times are logged every run and, with
+--startup-log, appended to a JSON Lines file.
+
 Requirements:
 - playwright
 - python-dotenv (optional, for credentials)
@@ -18,12 +33,18 @@ import asyncio
 import argparse
 import json
 import os
+import statistics
 import sys
 import time
 import logging
 from urllib.parse import quote_plus
 from pathlib import Path
 
+from browser_pool import PagePool
+from navigation_stats import NavigationStats
+from resource_filter import BLOCKABLE_TYPES, DEFAULT_BLOCKED_TYPES, DEFAULT_BLOCKED_URLS, ResourceFilter
+from scraper import GoogleGroupsScraper
+
 try:
     from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 except ImportError:
@@ -46,32 +67,258 @@ logging.basicConfig(
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 
+# Selectors that may match topic containers - the exact class names change
+TOPIC_SELECTORS = [
+    "div.sZwd7c", 
+    "div.i4WypI", 
+    "div.NpYXU", 
+    "a[href*='/m/']",
+    "a[href*='/c/']"
+]
+
+# Controls that load the next batch of topics when scrolling alone doesn't
+LOAD_MORE_SELECTOR = (
+    "[aria-label='Load more']:not([aria-disabled='true']), "
+    "[aria-label='Show more']:not([aria-disabled='true']), "
+    "[aria-label='Next page']:not([aria-disabled='true'])"
+)
+
+# Runs in the page: topic element -> {title, href, author, date}.
+# Title falls back to the first span, then the element itself, so every topic has one.
+_TOPIC_RECORD_JS = """
+element => {
+    const text = (...selectors) => {
+        for (const selector of selectors) {
+            const found = element.querySelector(selector);
+            if (found) return found.innerText;
+        }
+        return null;
+    };
+    return {
+        title: text("h3", "span") ?? element.innerText,
+        href: element.getAttribute("href"),
+        author: text("span[role='author']", ".bZI0O"),
+        date: text("span[role='date']", ".wJMDsd"),
+    };
+}
+"""
+
+# (topic elements, max topics) -> [record, ...]
+EXTRACT_TOPICS_JS = "(elements, maxTopics) => elements.slice(0, maxTopics).map(" + _TOPIC_RECORD_JS + ")"
+
+# selector -> undefined. Queues the topic elements already on the page, then every
+# matching element added later, so each batch only touches new nodes.
+HARVEST_START_JS = """
+selector => {
+    if (window.__topicHarvest) window.__topicHarvest.observer.disconnect();
+    const state = {queue: [...document.querySelectorAll(selector)], seen: new WeakSet(), last: null};
+    state.observer = new MutationObserver(mutations => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                if (node.matches(selector)) state.queue.push(node);
+                state.queue.push(...node.querySelectorAll(selector));
+            }
+        }
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true});
+    window.__topicHarvest = state;
+}
+"""
+
+# max records -> {records: [record, ...], pending: queued elements left}
+HARVEST_TAKE_JS = """
+maxRecords => {
+    const state = window.__topicHarvest;
+    const record = """ + _TOPIC_RECORD_JS + """;
+    const records = [];
+    while (state.queue.length && records.length < maxRecords) {
+        const batch = state.queue.splice(0, maxRecords - records.length);
+        for (const element of batch) {
+            if (state.seen.has(element) || !element.isConnected) continue;
+            state.seen.add(element);
+            state.last = element;
+            records.push(record(element));
+        }
+    }
+    return {records, pending: state.queue.length};
+}
+"""
+
+# load more selector or null -> {moved, clicked}. Scrolls the last harvested topic's
+# scroll container to the bottom; clicks a load-more control once it can't scroll further.
+HARVEST_ADVANCE_JS = """
+loadMoreSelector => {
+    const state = window.__topicHarvest;
+    let container = document.scrollingElement;
+    for (let node = state.last && state.last.parentElement; node; node = node.parentElement) {
+        const overflow = getComputedStyle(node).overflowY;
+        if ((overflow === "auto" || overflow === "scroll") && node.scrollHeight > node.clientHeight) {
+            container = node;
+            break;
+        }
+    }
+    const before = container.scrollTop;
+    container.scrollTop = container.scrollHeight;
+    if (container.scrollTop !== before) return {moved: true, clicked: false};
+    const button = loadMoreSelector && document.querySelector(loadMoreSelector);
+    if (button) {
+        button.click();
+        return {moved: false, clicked: true};
+    }
+    return {moved: false, clicked: false};
+}
+"""
+
+def topic_from_record(record):
+    """Turn a record from EXTRACT_TOPICS_JS into a topic dict"""
+    topic = {"title": record["title"]}
+    href = record.get("href")
+    if href:
+        topic["url"] = f"https://groups.google.com{href}" if href.startswith("/") else href
+    for field in ("author", "date"):
+        if record.get(field) is not None:
+            topic[field] = record[field]
+    return topic
+
+# Cookies that mean a browser profile is still signed in to Google
+SESSION_COOKIES = ("SID", "__Secure-1PSID")
+
+def record_startup(path, startup):
+    """
+    Append a run's startup timings to a JSON Lines log and log them against earlier runs
+    
+    Args:
+        path: Startup log file (None to only log this run)
+        startup: Dict with mode, launch, login and total seconds
+    """
+    previous = []
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                previous = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to read startup log {path}: {e}")
+    same_mode = [record["total"] for record in previous if record.get("mode") == startup["mode"]]
+    
+    message = (f"Startup ({startup['mode']}): launch {startup['launch']:.2f}s, "
+               f"login {startup['login']:.2f}s, total {startup['total']:.2f}s")
+    if same_mode:
+        message += f" (median of {len(same_mode)} earlier {startup['mode']} runs: {statistics.median(same_mode):.2f}s)"
+    logging.info(message)
+    
+    if path:
+        try:
+            with open(path, 'a') as f:
+                f.write(json.dumps(dict(startup, time=time.time())) + "\n")
+        except OSError as e:
+            logging.warning(f"Failed to write startup log {path}: {e}")
+
 class GoogleGroupsBrowserScraper:
-    def __init__(self, headless=False, slow_mo=100):
+    def __init__(self, headless=False, slow_mo=100, pages=1, max_navigations=50, max_tab_memory=None,
+                 resource_filter=None, nav_stats=None, user_data_dir=None, cdp_url=None, debug_port=None):
+        """
+        Args:
+            headless: Run the browser without a window
+            slow_mo: Slow every browser operation down by this many milliseconds
+            pages: Number of pages that scrape groups and topics concurrently
+            max_navigations: Replace a pooled page after this many navigations (0 never recycles)
+            max_tab_memory: Replace a pooled page whose JS heap exceeds this many MB (None for no limit)
+            resource_filter: ResourceFilter applied to group and topic pages once logged in (None to load everything)
+            nav_stats: NavigationStats recording every group and topic navigation (None to disable)
+            user_data_dir: Keep the browser profile in this directory between runs (None for a fresh profile)
+            cdp_url: Attach to an already running browser at this DevTools endpoint instead of launching one
+            debug_port: Expose the launched browser on this remote debugging port (used by browser_daemon.py)
+        """
         self.headless = headless
         self.slow_mo = slow_mo
+        self.pages = pages
+        self.max_navigations = max_navigations
+        self.max_tab_memory = max_tab_memory
+        self.playwright = None
         self.browser = None
         self.page = None
         self.context = None
+        self.pool = None
+        self.resource_filter = resource_filter
+        self.nav_stats = nav_stats
+        self.user_data_dir = user_data_dir
+        self.cdp_url = cdp_url
+        self.debug_port = debug_port
+        # Launch/attach and login seconds of this run
+        self.startup = {"mode": "cdp" if cdp_url else "persistent" if user_data_dir else "fresh",
+                        "launch": 0.0, "login": 0.0, "total": 0.0}
+        self._filter_installed = False
+        # Parses topic pages the same way the HTTP scraper does
+        self.thread_parser = GoogleGroupsScraper(None)
         
     async def start(self):
-        """Initialize the browser"""
+        """Initialize the browser: attach over CDP, open the persistent profile, or launch a fresh one"""
+        start_time = time.perf_counter()
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=self.slow_mo
-        )
-        self.context = await self.browser.new_context(viewport={"width": 1280, "height": 800})
-        self.page = await self.context.new_page()
+        args = [f"--remote-debugging-port={self.debug_port}"] if self.debug_port else []
+        if self.cdp_url:
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_url, slow_mo=self.slow_mo)
+            # The browser's default context holds the daemon's profile and sign-in
+            if self.browser.contexts:
+                self.context = self.browser.contexts[0]
+            else:
+                self.context = await self.browser.new_context(viewport={"width": 1280, "height": 800})
+        elif self.user_data_dir:
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                headless=self.headless,
+                slow_mo=self.slow_mo,
+                viewport={"width": 1280, "height": 800},
+                args=args
+            )
+        else:
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                slow_mo=self.slow_mo,
+                args=args
+            )
+            self.context = await self.browser.new_context(viewport={"width": 1280, "height": 800})
+        if self.user_data_dir and self.context.pages:
+            # A persistent context opens with a tab already
+            self.page = self.context.pages[0]
+        else:
+            self.page = await self.context.new_page()
+        self.pool = PagePool(self.context, self.pages, self.max_navigations, self.max_tab_memory)
+        self.startup["launch"] = self.startup["total"] = time.perf_counter() - start_time
         
     async def close(self):
         """Close the browser"""
-        if self.browser:
+        if self.pool:
+            self.pool.log_stats()
+            await self.pool.close()
+        if self.resource_filter:
+            self.resource_filter.log_stats()
+        if self.nav_stats:
+            self.nav_stats.log_stats()
+            self.nav_stats.save()
+        if self.cdp_url:
+            # The browser belongs to the daemon: close only what this run opened
+            if self._filter_installed:
+                await self.resource_filter.uninstall(self.context)
+            if self.page:
+                await self.page.close()
+        elif self.user_data_dir and self.context:
+            await self.context.close()
+        elif self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
     
-    async def login(self, email=None, password=None, cookies_path=None):
+    async def has_session_cookies(self):
+        """Return True if the browser context holds unexpired Google session cookies"""
+        now = time.time()
+        for cookie in await self.context.cookies("https://accounts.google.com"):
+            if cookie["name"] in SESSION_COOKIES and (cookie.get("expires", -1) <= 0 or cookie["expires"] > now):
+                return True
+        return False
+    
+    async def login(self, email=None, password=None, cookies_path=None, load_cookies=True):
         """
         Log in to Google account
         
@@ -79,9 +326,23 @@ class GoogleGroupsBrowserScraper:
             email: Google account email (if None, will use environment variable GOOGLE_EMAIL)
             password: Google account password (if None, will use environment variable GOOGLE_PASSWORD)
             cookies_path: Path to save/load cookies (if None, won't save/load cookies)
+            load_cookies: Try the cookies in cookies_path first; False always signs in and only saves them
         """
+        start_time = time.perf_counter()
+        try:
+            return await self._login(email, password, cookies_path, load_cookies)
+        finally:
+            self.startup["login"] = time.perf_counter() - start_time
+            self.startup["total"] = self.startup["launch"] + self.startup["login"]
+    
+    async def _login(self, email, password, cookies_path, load_cookies=True):
+        # A kept profile or a daemon's browser usually still has its session; skip the sign-in check
+        if (self.user_data_dir or self.cdp_url) and await self.has_session_cookies():
+            logging.info("Browser profile is already signed in")
+            return True
+        
         # Try to load cookies if available
-        if cookies_path and os.path.exists(cookies_path):
+        if load_cookies and cookies_path and os.path.exists(cookies_path):
             try:
                 logging.info(f"Loading cookies from {cookies_path}")
                 with open(cookies_path, 'r') as f:
@@ -150,23 +411,45 @@ class GoogleGroupsBrowserScraper:
             
         return True
     
-    async def navigate_to_group(self, group_email):
-        """Navigate to the Google Group page"""
+    async def block_resources(self):
+        """
+        Start aborting the resources the resource filter blocks, on every page of the context
+        
+        Call this after login: the sign-in pages are left intact.
+        """
+        if self.resource_filter:
+            await self.resource_filter.install(self.context)
+            self._filter_installed = True
+            logging.info(f"Blocking {', '.join(sorted(self.resource_filter.types)) or 'no resource types'} "
+                         f"and {len(self.resource_filter.url_patterns)} URL patterns")
+    
+    async def _goto(self, page, url, kind):
+        if self.nav_stats:
+            return await self.nav_stats.goto(page, url, kind)
+        return await page.goto(url)
+    
+    def _extracted(self, page):
+        if self.nav_stats:
+            self.nav_stats.finish_extract(page)
+    
+    async def navigate_to_group(self, group_email, page=None):
+        """Navigate to the Google Group page (on self.page unless another page is given)"""
+        page = page or self.page
         encoded_group = quote_plus(group_email)
         url = f"https://groups.google.com/g/{encoded_group}"
         
         logging.info(f"Navigating to group: {url}")
-        await self.page.goto(url)
+        await self._goto(page, url, "group")
         
         # Check if we need to log in
-        if "accounts.google.com/signin" in self.page.url:
+        if "accounts.google.com/signin" in page.url:
             logging.info("Login required to access this group")
             return False
             
         # Check if we have access to the group
         no_access_selector = "text='You don't have permission to access this content'"
         try:
-            no_access = await self.page.wait_for_selector(no_access_selector, timeout=2000)
+            no_access = await page.wait_for_selector(no_access_selector, timeout=2000)
             if no_access:
                 logging.error("You don't have permission to access this group")
                 return False
@@ -176,67 +459,32 @@ class GoogleGroupsBrowserScraper:
             
         return True
     
-    async def scrape_topics(self, max_topics=20):
-        """Scrape topics from the current group page"""
+    async def find_topic_selector(self, page):
+        """Wait for topics to appear and return the selector that matches them, or None"""
+        for selector in TOPIC_SELECTORS:
+            try:
+                await page.wait_for_selector(selector, timeout=3000)
+                logging.info(f"Found topics with selector: {selector}")
+                return selector
+            except PlaywrightTimeoutError:
+                continue
+        logging.error("Couldn't find any topics on the page")
+        return None
+    
+    async def scrape_topics(self, max_topics=20, page=None):
+        """Scrape topics from the current group page (on self.page unless another page is given)"""
+        page = page or self.page
         topics = []
         
         # Wait for topics to load
         try:
-            # Look for topic containers - the exact selector may change
-            # Try different possible selectors
-            selectors = [
-                "div.sZwd7c", 
-                "div.i4WypI", 
-                "div.NpYXU", 
-                "a[href*='/m/']",
-                "a[href*='/c/']"
-            ]
-            
-            topic_selector = None
-            for selector in selectors:
-                try:
-                    await self.page.wait_for_selector(selector, timeout=3000)
-                    topic_selector = selector
-                    logging.info(f"Found topics with selector: {selector}")
-                    break
-                except PlaywrightTimeoutError:
-                    continue
-                    
+            topic_selector = await self.find_topic_selector(page)
             if not topic_selector:
-                logging.error("Couldn't find any topics on the page")
                 return topics
                 
-            # Get all topic elements
-            topic_elements = await self.page.query_selector_all(topic_selector)
-            
-            for element in topic_elements[:max_topics]:
-                topic = {}
-                
-                # Extract title
-                title_element = await element.query_selector("h3") or await element.query_selector("span") or element
-                if title_element:
-                    topic["title"] = await title_element.inner_text()
-                
-                # Extract URL if it's a link
-                href = await element.get_attribute("href")
-                if href:
-                    if href.startswith("/"):
-                        topic["url"] = f"https://groups.google.com{href}"
-                    else:
-                        topic["url"] = href
-                
-                # Extract author if available
-                author_element = await element.query_selector("span[role='author']") or await element.query_selector(".bZI0O")
-                if author_element:
-                    topic["author"] = await author_element.inner_text()
-                
-                # Extract date if available
-                date_element = await element.query_selector("span[role='date']") or await element.query_selector(".wJMDsd")
-                if date_element:
-                    topic["date"] = await date_element.inner_text()
-                
-                if topic and "title" in topic:
-                    topics.append(topic)
+            # Extract every topic in the browser and get them back in one round trip
+            records = await page.eval_on_selector_all(topic_selector, EXTRACT_TOPICS_JS, max_topics)
+            topics = [topic_from_record(record) for record in records]
             
             logging.info(f"Scraped {len(topics)} topics")
             
@@ -245,43 +493,215 @@ class GoogleGroupsBrowserScraper:
             
         return topics
     
-    async def scrape_group(self, group_email, max_topics=20):
+    async def harvest_topics(self, max_topics=0, page=None, idle_timeout=10.0, batch_size=500, poll_interval=0.25):
+        """
+        Scroll through the current group page, extracting topics as they are appended
+        
+        Only elements added since the previous batch are read, so each batch
+        costs about the same however many topics have been harvested.
+        Topics are de-duplicated by URL, which also covers lists that
+        re-render rows as they scroll.
+        
+        Args:
+            max_topics: Stop once this many topics have been harvested (0 for no limit)
+            page: Page to scrape on (default: self.page)
+            idle_timeout: Stop after this many seconds without a new topic
+            batch_size: Most topics read from the page per round trip
+            poll_interval: Seconds to let the page load more topics after scrolling
+            
+        Returns:
+            List of topics with their details
+        """
+        page = page or self.page
+        topics = []
+        topic_selector = await self.find_topic_selector(page)
+        if not topic_selector:
+            return topics
+        
+        seen = set()
+        start_time = last_new = time.monotonic()
+        reason = None
+        # After clicking load-more, wait for its topics before clicking again, or pages get skipped
+        awaiting_load = False
+        try:
+            await page.evaluate(HARVEST_START_JS, topic_selector)
+            while reason is None:
+                batch = await page.evaluate(HARVEST_TAKE_JS, batch_size)
+                for record in batch["records"]:
+                    topic = topic_from_record(record)
+                    key = topic.get("url") or topic["title"]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    topics.append(topic)
+                    last_new = time.monotonic()
+                    awaiting_load = False
+                    if len(topics) % 1000 == 0:
+                        logging.info(f"Harvested {len(topics)} topics ({len(topics) / (last_new - start_time):.0f}/s)")
+                    if max_topics and len(topics) >= max_topics:
+                        reason = "reached the target count"
+                        break
+                if reason or batch["pending"]:
+                    continue
+                
+                progress = await page.evaluate(HARVEST_ADVANCE_JS, None if awaiting_load else LOAD_MORE_SELECTOR)
+                awaiting_load = awaiting_load or progress["clicked"]
+                if time.monotonic() - last_new > idle_timeout:
+                    if progress["moved"] or awaiting_load:
+                        reason = f"no new topics for {idle_timeout:.0f}s"
+                    else:
+                        reason = "reached the end of the list"
+                    break
+                await page.wait_for_timeout(poll_interval * 1000)
+        except Exception as e:
+            reason = f"error: {e}"
+            logging.error(f"Error harvesting topics: {e}")
+        
+        logging.info(f"Harvested {len(topics)} topics in {time.monotonic() - start_time:.1f}s; {reason}")
+        return topics
+    
+    async def scrape_group(self, group_email, max_topics=20, page=None, scroll=False, idle_timeout=10.0):
         """
         Scrape a Google Group
         
         Args:
             group_email: The email address of the Google Group
-            max_topics: Maximum number of topics to scrape
+            max_topics: Maximum number of topics to scrape (0 for all with scroll)
+            page: Page to scrape on (default: self.page)
+            scroll: Keep scrolling for more topics instead of reading only the first screen
+            idle_timeout: With scroll, stop after this many seconds without a new topic
             
         Returns:
             List of topics with their details
         """
+        page = page or self.page
+        
         # Navigate to the group
-        has_access = await self.navigate_to_group(group_email)
+        has_access = await self.navigate_to_group(group_email, page)
         if not has_access:
             return []
             
         # Scrape topics
-        topics = await self.scrape_topics(max_topics)
+        if scroll:
+            topics = await self.harvest_topics(max_topics, page, idle_timeout)
+        else:
+            topics = await self.scrape_topics(max_topics, page)
+        self._extracted(page)
         return topics
+    
+    async def scrape_groups(self, group_emails, max_topics=20, scroll=False, idle_timeout=10.0):
+        """
+        Scrape several Google Groups concurrently on the page pool
+        
+        Returns:
+            dict: Group email -> list of topics ([] if the group couldn't be scraped)
+        """
+        async def scrape(page, group_email):
+            return await self.scrape_group(group_email, max_topics, page, scroll, idle_timeout)
+        
+        results = await self.pool.map(scrape, group_emails)
+        return {group: topics or [] for group, topics in zip(group_emails, results)}
+    
+    async def scrape_topic(self, topic_url, page=None):
+        """
+        Open a topic page and extract its posts
+        
+        Args:
+            topic_url: URL of the topic
+            page: Page to scrape on (default: self.page)
+            
+        Returns:
+            dict: Thread details in the same format as GoogleGroupsScraper.extract_thread_content
+        """
+        page = page or self.page
+        logging.info(f"Opening topic: {topic_url}")
+        await self._goto(page, topic_url, "topic")
+        try:
+            # Posts are rendered after the initial load
+            await page.wait_for_load_state("networkidle", timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
+        html = await page.content()
+        self._extracted(page)
+        # parse_thread_content is CPU-bound; keep the event loop free for the other pages
+        return await asyncio.to_thread(self.thread_parser.parse_thread_content, html, topic_url)
+    
+    async def scrape_topic_contents(self, topics):
+        """
+        Open the topic pages concurrently on the page pool and attach their posts
+        
+        Args:
+            topics: Topics from scrape_topics; each with a URL gets a "content" key
+        """
+        with_urls = [topic for topic in topics if "url" in topic]
+        contents = await self.pool.map(lambda page, topic: self.scrape_topic(topic["url"], page), with_urls)
+        for topic, content in zip(with_urls, contents):
+            if content:
+                topic["content"] = content
+
+def print_topics(group_email, topics):
+    """Print a group's topics to the console"""
+    print(f"\nFound {len(topics)} topics in {group_email}:\n")
+    for i, topic in enumerate(topics, 1):
+        print(f"{i}. {topic.get('title', 'No Title')}")
+        if "author" in topic:
+            print(f"   Author: {topic['author']}")
+        if "date" in topic:
+            print(f"   Date: {topic['date']}")
+        if "url" in topic:
+            print(f"   URL: {topic['url']}")
+        if "content" in topic:
+            print(f"   Posts: {len(topic['content']['posts'])}")
+        print()
 
 async def main():
     parser = argparse.ArgumentParser(description="Scrape Google Groups using browser automation")
-    parser.add_argument("group", help="Google Group email address (e.g., groupname@googlegroups.com)")
+    parser.add_argument("groups", nargs="+", help="Google Group email addresses (e.g., groupname@googlegroups.com)")
     parser.add_argument("--email", help="Google account email (if not provided, will use GOOGLE_EMAIL environment variable)")
     parser.add_argument("--password", help="Google account password (if not provided, will use GOOGLE_PASSWORD environment variable)")
     parser.add_argument("--cookies", default="cookies/google_cookies.json", help="Path to save/load cookies (default: cookies/google_cookies.json)")
-    parser.add_argument("--topics", type=int, default=20, help="Number of topics to fetch (default: 20)")
+    parser.add_argument("--topics", type=int, default=20, help="Number of topics to fetch (default: 20, 0 for all with --scroll)")
+    parser.add_argument("--scroll", action="store_true",
+                        help="Keep scrolling and loading more topics until --topics are found, the list ends "
+                             "or nothing new appears for --idle-timeout seconds")
+    parser.add_argument("--idle-timeout", type=float, default=10.0,
+                        help="With --scroll, stop after this many seconds without a new topic (default: 10)")
+    parser.add_argument("--content", action="store_true", help="Also open every topic and extract its posts")
     parser.add_argument("--output", help="Output file path for JSON results")
     parser.add_argument("--visible", action="store_true", help="Show the browser window during scraping")
     parser.add_argument("--slow", type=int, default=100, help="Slow down automation by this many milliseconds (default: 100)")
+    parser.add_argument("--pages", type=int, default=1, help="Browser pages scraping groups and topics concurrently (default: 1)")
+    parser.add_argument("--recycle-after", type=int, default=50,
+                        help="Replace a page after this many navigations to stop memory growth (default: 50, 0 never)")
+    parser.add_argument("--max-tab-memory", type=int, help="Replace a page whose JS heap grows past this many MB")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="Abort images, fonts, stylesheets, media and analytics requests on group and topic pages")
+    parser.add_argument("--block-types", nargs="*", choices=BLOCKABLE_TYPES, default=list(DEFAULT_BLOCKED_TYPES),
+                        help=f"Resource types --block-resources aborts (default: {' '.join(DEFAULT_BLOCKED_TYPES)})")
+    parser.add_argument("--block-url", action="append", default=[], metavar="PATTERN",
+                        help="Also abort URLs matching this shell-style pattern with --block-resources (repeatable)")
+    parser.add_argument("--nav-stats", metavar="FILE",
+                        help="Record requests, bytes and load time per navigation and write them to this JSON file")
+    parser.add_argument("--user-data-dir", help="Keep the browser profile (sign-in, cache) in this directory between runs")
+    parser.add_argument("--cdp", metavar="URL",
+                        help="Attach to a running browser_daemon.py at this DevTools URL (e.g. http://127.0.0.1:9222)")
+    parser.add_argument("--startup-log", metavar="FILE",
+                        help="Append this run's launch and login times to a JSON Lines file and compare with earlier runs")
     
     args = parser.parse_args()
     
     # Create scraper
     scraper = GoogleGroupsBrowserScraper(
         headless=not args.visible,
-        slow_mo=args.slow
+        slow_mo=args.slow,
+        pages=args.pages,
+        max_navigations=args.recycle_after,
+        max_tab_memory=args.max_tab_memory,
+        resource_filter=(ResourceFilter(args.block_types, DEFAULT_BLOCKED_URLS + tuple(args.block_url))
+                         if args.block_resources else None),
+        nav_stats=NavigationStats(args.nav_stats) if args.nav_stats else None,
+        user_data_dir=args.user_data_dir,
+        cdp_url=args.cdp
     )
     
     try:
@@ -289,31 +709,27 @@ async def main():
         
         # Login if needed
         await scraper.login(args.email, args.password, args.cookies)
+        record_startup(args.startup_log, scraper.startup)
+        await scraper.block_resources()
         
-        # Scrape group
-        topics = await scraper.scrape_group(args.group, args.topics)
+        # Scrape groups
+        results = await scraper.scrape_groups(args.groups, args.topics, args.scroll, args.idle_timeout)
+        if args.content:
+            await scraper.scrape_topic_contents([topic for topics in results.values() for topic in topics])
         
-        if topics:
-            if args.output:
-                # Save to file
-                with open(args.output, 'w') as f:
-                    json.dump(topics, f, indent=2)
-                logging.info(f"Topics saved to {args.output}")
-            else:
-                # Print to console
-                print(f"\nFound {len(topics)} topics in {args.group}:\n")
-                for i, topic in enumerate(topics, 1):
-                    print(f"{i}. {topic.get('title', 'No Title')}")
-                    if "author" in topic:
-                        print(f"   Author: {topic['author']}")
-                    if "date" in topic:
-                        print(f"   Date: {topic['date']}")
-                    if "url" in topic:
-                        print(f"   URL: {topic['url']}")
-                    print()
-        else:
-            print(f"\nNo topics found or unable to access the group: {args.group}")
-            print("Note: If this is a private group, you need to be a member and logged in.")
+        if args.output and any(results.values()):
+            # One group keeps the plain topic list format
+            data = results[args.groups[0]] if len(args.groups) == 1 else results
+            with open(args.output, 'w') as f:
+                json.dump(data, f, indent=2)
+            logging.info(f"Topics saved to {args.output}")
+        
+        for group_email, topics in results.items():
+            if not topics:
+                print(f"\nNo topics found or unable to access the group: {group_email}")
+                print("Note: If this is a private group, you need to be a member and logged in.")
+            elif not args.output:
+                print_topics(group_email, topics)
     
     finally:
         await scraper.close()
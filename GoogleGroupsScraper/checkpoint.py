@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Manifest for Batch Extraction
+
+Records the status of every thread processed by batch_extractor.py so an
+interrupted or partially failed run can be resumed. The manifest is an
+append-only JSON Lines file: each status change appends one line, and the
+last line for a thread ID wins when the manifest is loaded. The whole
+manifest is held in a dict, so status lookups are O(1) per URL.
+
+Statuses:
+    pending    Seen in the input but not attempted yet
+    completed  Extracted and saved successfully
+    failed     Fetching, parsing or saving failed
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class CheckpointManifest:
+    def __init__(self, path):
+        """
+        Args:
+            path: Path to the manifest JSON Lines file (created if missing)
+        """
+        self.path = path
+        self.entries = {}
+        self._appended = 0
+        self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["thread_id"]] = entry
+                except (ValueError, KeyError):
+                    # A torn last line from an interrupted run is expected; skip it
+                    logging.warning(f"Skipping unreadable manifest line {line_number} in {self.path}")
+        logging.info(f"Loaded checkpoint manifest with {len(self.entries)} threads from {self.path}")
+
+    def status(self, thread_id):
+        """Return the recorded status for a thread ID, or None if it has never been seen"""
+        entry = self.entries.get(thread_id)
+        return entry["status"] if entry else None
+
+    def mark(self, thread_id, url, status, **extra):
+        """Record a status change and append it to the manifest immediately"""
+        entry = {
+            "thread_id": thread_id,
+            "url": url,
+            "status": status,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        entry.update(extra)
+        self.entries[thread_id] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._appended += 1
+
+    def counts(self):
+        """Return the number of threads in each status"""
+        counts = {PENDING: 0, COMPLETED: 0, FAILED: 0}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def close(self):
+        """Close the manifest, rewriting it with one line per thread if it has grown"""
+        self._file.close()
+        if self._appended == 0:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
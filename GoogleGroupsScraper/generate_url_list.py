@@ -15,7 +15,10 @@ Example:
 import argparse
 import logging
 import sys
-from scraper import GoogleGroupsScraper
+from sync_state import SyncWatermark
+from scraper import (GoogleGroupsScraper, add_base_url_argument, add_browser_login_arguments, add_metrics_argument,
+                     add_parser_argument, add_rate_arguments, browser_login_from_args, metrics_from_args,
+                     rate_limiter_from_args, rebase_url)
 
 # Configure logging
 logging.basicConfig(
@@ -30,11 +33,23 @@ def main():
     parser.add_argument("--cookies", help="Path to JSON file with authentication cookies (for private groups)")
     parser.add_argument("--output", default="thread_urls.txt", help="Output file for thread URLs (default: thread_urls.txt)")
     parser.add_argument("--pages", type=int, default=5, help="Maximum number of pages to scrape (default: 5)")
+    parser.add_argument("--sync-state", help="JSON file with per-group sync watermarks; only list new or changed threads. "
+                                             "Listed threads stay pending until batch_extractor.py --sync-state fetches them")
+    add_parser_argument(parser)
+    add_rate_arguments(parser)
+    add_metrics_argument(parser)
+    add_base_url_argument(parser)
+    add_browser_login_arguments(parser)
     
     args = parser.parse_args()
     
     # Initialize scraper
-    scraper = GoogleGroupsScraper(args.group_url)
+    scraper = GoogleGroupsScraper(args.group_url, parser=args.parser,
+                                  rate_limiter=rate_limiter_from_args(args),
+                                  watermark=SyncWatermark(args.sync_state, rebase_url(args.group_url, args.base_url),
+                                                          require_content=True)
+                                  if args.sync_state else None,
+                                  metrics=metrics_from_args(args), base_url=args.base_url)
     
     # Authenticate with cookies if provided
     if args.cookies:
@@ -42,10 +57,28 @@ def main():
             logging.error("Failed to authenticate with provided cookies. Exiting.")
             return 1
     
+    browser_login = browser_login_from_args(args)
+    if browser_login:
+        if not browser_login.login(scraper.session):
+            logging.error("Browser login failed. Exiting.")
+            return 1
+        scraper.reauthenticate = browser_login.refresh
+    
     # Scrape threads
-    logging.info(f"Scraping threads from group: {args.group_url}")
+    logging.info(f"Scraping threads from group: {scraper.group_url}")
     threads = scraper.scrape_group(max_pages=args.pages)
     
+    if scraper.metrics:
+        scraper.metrics.log_stats()
+        scraper.metrics.save()
+    
+    if scraper.watermark:
+        scraper.watermark.log_stats()
+        if not threads:
+            scraper.watermark.save()
+            logging.info("No new or changed threads since the last sync.")
+            return 0
+    
     if not threads:
         logging.error("No threads found. The group might be private or empty.")
         return 1
@@ -69,12 +102,17 @@ def main():
         
         # Show example usage of batch_extractor.py
         print("\nTo extract content from these threads, run:")
-        print(f"python batch_extractor.py {args.output}" + (f" --cookies {args.cookies}" if args.cookies else ""))
+        print(f"python batch_extractor.py {args.output}" + (f" --cookies {args.cookies}" if args.cookies else "")
+              + (f" --sync-state {args.sync_state}" if args.sync_state else ""))
         
     except Exception as e:
         logging.error(f"Failed to save thread URLs: {e}")
         return 1
     
+    # Only once the URL list exists; the listed threads stay pending until batch_extractor.py confirms them
+    if scraper.watermark:
+        scraper.watermark.save()
+    
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Response Cache
+
+An on-disk cache used by GoogleGroupsScraper.get_page. Responses are keyed by
+URL and cookie identity, so public and authenticated views of the same page
+never mix. Stale entries are revalidated with ETag/If-Modified-Since, and the
+cache is trimmed to a size cap by evicting the least recently used entries.
+
+Layout:
+    <cache_dir>/index.db      SQLite index of entry metadata
+    <cache_dir>/<key>.body    Raw response body
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ResponseCache:
+    def __init__(self, cache_dir, ttl=3600, max_bytes=500 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Directory to store cached responses in
+            ttl: Seconds a cached response is served without revalidation
+            max_bytes: Total body size to keep before evicting LRU entries
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "index.db"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def cookie_identity(cookies):
+        """Return a stable digest of a cookie jar's name/value pairs"""
+        pairs = sorted(f"{cookie.name}={cookie.value}" for cookie in cookies)
+        return hashlib.sha256("\n".join(pairs).encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _key(url, identity):
+        return hashlib.sha256(f"{identity}\n{url}".encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return self.cache_dir / f"{key}.body"
+
+    def _entry(self, key):
+        row = self._db.execute(
+            "SELECT etag, last_modified, encoding, size, stored_at FROM entries WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if not row or not self._body_path(key).exists():
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "encoding": row[2],
+            "size": row[3],
+            "stored_at": row[4],
+        }
+
+    def _build_response(self, key, url, entry):
+        response = requests.Response()
+        response._content = self._body_path(key).read_bytes()
+        response.status_code = 200
+        response.url = url
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict()
+        if entry["etag"]:
+            response.headers["ETag"] = entry["etag"]
+        if entry["last_modified"]:
+            response.headers["Last-Modified"] = entry["last_modified"]
+        response.from_cache = True
+        return response
+
+    def _touch(self, key, now, refresh=False):
+        if refresh:
+            self._db.execute("UPDATE entries SET last_access = ?, stored_at = ? WHERE key = ?", (now, now, key))
+        else:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        self._db.commit()
+
+    def fresh_response(self, url, identity):
+        """Return the cached response if it is still within the TTL, else None"""
+        key = self._key(url, identity)
+        with self._lock:
+            entry = self._entry(key)
+            now = time.time()
+            if not entry or now - entry["stored_at"] > self.ttl:
+                return None
+            self._touch(key, now)
+            self.hits += 1
+            self.bytes_saved += entry["size"]
+            return self._build_response(key, url, entry)
+
+    def conditional_headers(self, url, identity):
+        """Return If-None-Match/If-Modified-Since headers for a stale entry"""
+        key = self._key(url, identity)
+        with self._lock:
+            entry = self._entry(key)
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidate(self, url, identity):
+        """Handle a 304 by refreshing the entry and returning the cached body"""
+        key = self._key(url, identity)
+        with self._lock:
+            entry = self._entry(key)
+            if not entry:
+                return None
+            self._touch(key, time.time(), refresh=True)
+            self.revalidated += 1
+            self.bytes_saved += entry["size"]
+            return self._build_response(key, url, entry)
+
+    def record_miss(self):
+        """Count a request that could not be answered without going to the network"""
+        with self._lock:
+            self.misses += 1
+
+    def store(self, url, identity, response):
+        """Store a successful response and evict old entries past the size cap"""
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        # A redirected response belongs to another URL (e.g. a sign-in page), not to this one
+        if response.history or urlparse(response.url).netloc != urlparse(url).netloc:
+            return
+        key = self._key(url, identity)
+        body = response.content
+        now = time.time()
+        with self._lock:
+            try:
+                self._body_path(key).write_bytes(body)
+            except OSError as e:
+                logging.warning(f"Failed to write cache entry for {url}: {e}")
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 response.encoding, len(body), now, now)
+            )
+            self._db.commit()
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._body_path(key).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+        self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters for this run; revalidated requests are also counted as misses"""
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        logging.info(
+            f"Cache: {stats['hits']} fresh hits, {stats['misses']} misses "
+            f"({stats['revalidated']} revalidated with 304), {stats['bytes_saved'] / 1024:.1f} KiB saved"
+        )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Browser Navigation Statistics
+
+Measures what each browser navigation costs: how many requests it made,
+how many bytes came over the wire, how many requests were blocked or
+failed, how long the page took to fire its load event, and how long until
+the scraper had its data. Comparing runs with and without
+--block-resources shows what the resource filter saves.
+
+Bytes are the encoded (on-the-wire) sizes Playwright reports for every
+request that finished before the load event, headers included.
+
+Stats file layout:
+    {
+        "summary": {"<kind>": {"count": N, "requests": n, "blocked": n, "kb": {p50, p95, max, total},
+                               "load": {p50, p95, max}, "extract": {p50, p95, max}}, ...},
+        "navigations": [{"url", "kind", "requests", "blocked", "bytes", "load", "extract"}, ...]
+    }
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from request_metrics import percentile
+
+
+class NavigationStats:
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON file to write the statistics to on save (None to only log them)
+        """
+        self.path = path
+        self.navigations = []
+        # Page -> (record, start time) of its latest navigation, until finish_extract
+        self._pending = {}
+
+    async def goto(self, page, url, kind, **kwargs):
+        """
+        Navigate page to url, recording requests, bytes and time to the load event
+
+        Args:
+            page: Playwright Page
+            url: URL to open
+            kind: Navigation label, e.g. "group" or "topic"
+            **kwargs: Passed to page.goto
+
+        Returns:
+            The response from page.goto; call finish_extract(page) once the page's data has been read
+        """
+        record = {"url": url, "kind": kind, "requests": 0, "blocked": 0, "bytes": 0, "load": None, "extract": None}
+        sizes = []
+
+        def on_finished(request):
+            record["requests"] += 1
+            sizes.append(asyncio.ensure_future(request.sizes()))
+
+        def on_failed(request):
+            record["requests"] += 1
+            if request.failure and "BLOCKED_BY_CLIENT" in request.failure:
+                record["blocked"] += 1
+
+        page.on("requestfinished", on_finished)
+        page.on("requestfailed", on_failed)
+        start = time.perf_counter()
+        self._pending[page] = (record, start)
+        try:
+            response = await page.goto(url, **kwargs)
+            record["load"] = time.perf_counter() - start
+        finally:
+            page.remove_listener("requestfinished", on_finished)
+            page.remove_listener("requestfailed", on_failed)
+            for result in await asyncio.gather(*sizes, return_exceptions=True):
+                if isinstance(result, dict):
+                    # Sizes the browser couldn't determine are reported as -1
+                    record["bytes"] += sum(max(0, size) for size in result.values())
+            self.navigations.append(record)
+        return response
+
+    def finish_extract(self, page):
+        """Record the time from the start of page's latest navigation until its data was extracted"""
+        pending = self._pending.pop(page, None)
+        if pending:
+            record, start = pending
+            record["extract"] = time.perf_counter() - start
+
+    def summary(self):
+        """Return request counts and byte and time percentiles for every navigation kind"""
+        summary = {}
+        for kind in sorted({record["kind"] for record in self.navigations}):
+            records = [record for record in self.navigations if record["kind"] == kind]
+            kb = [record["bytes"] / 1024 for record in records]
+            loads = [record["load"] for record in records if record["load"] is not None]
+            extracts = [record["extract"] for record in records if record["extract"] is not None]
+            summary[kind] = {
+                "count": len(records),
+                "requests": sum(record["requests"] for record in records),
+                "blocked": sum(record["blocked"] for record in records),
+                "kb": {"p50": percentile(kb, 50), "p95": percentile(kb, 95), "max": max(kb), "total": sum(kb)},
+                "load": {"p50": percentile(loads, 50), "p95": percentile(loads, 95), "max": max(loads, default=None)},
+                "extract": {"p50": percentile(extracts, 50), "p95": percentile(extracts, 95),
+                            "max": max(extracts, default=None)},
+            }
+        return summary
+
+    def log_stats(self):
+        for kind, stats in self.summary().items():
+            load, extract = stats["load"], stats["extract"]
+            logging.info(
+                f"Navigations ({kind}): {stats['count']}, {stats['requests']} requests ({stats['blocked']} blocked), "
+                f"{stats['kb']['total']:.0f} KB total, p50 {stats['kb']['p50']:.0f} KB"
+                + (f", load p50 {load['p50'] * 1000:.0f} ms p95 {load['p95'] * 1000:.0f} ms" if load["p50"] is not None else "")
+                + (f", extract p50 {extract['p50'] * 1000:.0f} ms" if extract["p50"] is not None else "")
+            )
+
+    def save(self):
+        """Write the summary and all navigation records to the stats file"""
+        if not self.path:
+            return
+        data = {
+            "summary": self.summary(),
+            "navigations": self.navigations,
+        }
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            logging.info(f"Saved navigation stats to {self.path}")
+        except OSError as e:
+            logging.warning(f"Failed to save navigation stats {self.path}: {e}")
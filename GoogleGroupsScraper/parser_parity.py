@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Parser Backend Parity Check
+
+Runs the scraper's extraction methods over saved HTML pages with every
+available parser backend and reports any output that differs from the
+html.parser reference. It also checks that each backend's partial-tree
+listing parse (extract_listing) finds the same threads and next page as a
+full parse.
+
+Without arguments, the synthetic listing and thread pages (see
+synthetic_pages.py) are checked in both layouts, plus the listings inside
+page_source.html's real markup. Pages that nothing is extracted from are
+reported, since backends agree trivially on them.
+
+Usage:
+    python parser_parity.py [page.html ...]
+
+Example:
+    python parser_parity.py
+    python parser_parity.py saved_pages/*.html
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from parsers import DEFAULT_PARSER, available_backends, make_soup
+from scraper import DEFAULT_BASE_URL, GoogleGroupsScraper
+from synthetic_pages import LAYOUTS, in_chrome, listing_page, thread_page
+
+PARITY_GROUP = "/g/parity"
+
+# Saved real page whose markup the synthetic listings are also checked inside
+CHROME_PAGE = Path(__file__).with_name("page_source.html")
+
+
+def default_pages():
+    """
+    Build the default corpus: synthetic listing and thread pages in every layout
+
+    Returns:
+        list: (name, html, page_url) tuples
+    """
+    chrome = CHROME_PAGE.read_text(encoding="utf-8") if CHROME_PAGE.exists() else None
+    group_url = f"{DEFAULT_BASE_URL}{PARITY_GROUP}"
+    pages = []
+    for layout in LAYOUTS:
+        listing = listing_page(PARITY_GROUP, [f"{layout}{i:03d}" for i in range(30)], f"{PARITY_GROUP}?page=2", layout)
+        pages.append((f"listing_{layout}", listing, group_url))
+        # Custom elements whose names start like a skipped tag must survive the body-only parse
+        pages.append((f"listing_{layout} with custom elements",
+                      listing.replace("<body>", "<body><svg-icon></svg-icon><script-loader></script-loader>"), group_url))
+        if chrome:
+            pages.append((f"listing_{layout} in {CHROME_PAGE.name}", in_chrome(listing, chrome), group_url))
+        thread_id = f"parity-{layout}"
+        pages.append((f"thread_{layout}", thread_page(thread_id, 20, layout), f"{group_url}/c/{thread_id}"))
+    return pages
+
+
+def saved_page(path):
+    """Read a saved page as a (name, html, page_url) tuple"""
+    return str(path), Path(path).read_text(encoding="utf-8"), Path(path).resolve().as_uri()
+
+
+def extract_all(scraper, html, page_url):
+    """Run every extraction method over a page and return the combined results"""
+    soup = make_soup(html, scraper.parser)
+    return {
+        "threads": scraper.extract_thread_info(soup),
+        "next_page": scraper.extract_next_page(soup),
+        "listing": list(scraper.extract_listing(html, page_url)),
+        "thread_content": scraper.parse_thread_content(html, page_url),
+    }
+
+
+def check_listing(backend, result):
+    """Report whether the partial-tree listing parse matched the full parse"""
+    if result["listing"] == [result["threads"], result["next_page"]]:
+        return True
+    print(f"  {backend} partial listing parse differs from the full parse:")
+    print(f"    expected: {json.dumps([result['threads'], result['next_page']], ensure_ascii=False)[:300]}")
+    print(f"    got:      {json.dumps(result['listing'], ensure_ascii=False)[:300]}")
+    return False
+
+
+def compare_page(html, page_url, backends):
+    """
+    Compare each backend's output against the reference parser
+
+    Returns:
+        tuple: (names of the backends whose output differs, whether the reference extracted anything)
+    """
+    scraper = GoogleGroupsScraper(page_url, parser=DEFAULT_PARSER)
+    reference = extract_all(scraper, html, page_url)
+    extracted = bool(reference["threads"] or reference["next_page"] or reference["thread_content"]["posts"])
+
+    mismatches = []
+    if DEFAULT_PARSER in backends and not check_listing(DEFAULT_PARSER, reference):
+        mismatches.append(DEFAULT_PARSER)
+    for backend in backends:
+        if backend == DEFAULT_PARSER:
+            continue
+        scraper.parser = backend
+        result = extract_all(scraper, html, page_url)
+        if not check_listing(backend, result):
+            mismatches.append(backend)
+        elif result != reference:
+            mismatches.append(backend)
+            for key in reference:
+                if result[key] != reference[key]:
+                    print(f"  {backend} differs in {key}:")
+                    print(f"    expected: {json.dumps(reference[key], ensure_ascii=False)[:300]}")
+                    print(f"    got:      {json.dumps(result[key], ensure_ascii=False)[:300]}")
+    return mismatches, extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that all parser backends extract identical data")
+    parser.add_argument("pages", nargs="*",
+                        help="Saved HTML pages to compare (default: synthetic pages in every layout)")
+
+    args = parser.parse_args()
+
+    # The extraction methods log every selector match; only show problems
+    logging.getLogger().setLevel(logging.ERROR)
+
+    backends = available_backends()
+    print(f"Comparing backends: {', '.join(backends)}")
+
+    pages = [saved_page(path) for path in args.pages] if args.pages else default_pages()
+    failed = False
+    for name, html, page_url in pages:
+        mismatches, extracted = compare_page(html, page_url, backends)
+        if mismatches:
+            failed = True
+            print(f"FAIL {name}: {', '.join(mismatches)}")
+        elif not extracted:
+            print(f"EMPTY {name}: no threads, next page or posts extracted, nothing was compared")
+        else:
+            print(f"OK   {name}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Backends
+
+The scraper only needs a small part of the BeautifulSoup API: select,
+select_one, get_text, get, parent and title.string. This module builds a
+document with that interface from one of several backends:
+
+- html.parser: BeautifulSoup with Python's built-in parser (default, slowest)
+- lxml: BeautifulSoup with the lxml parser (requires lxml)
+- selectolax: the lexbor engine behind a small adapter (requires selectolax)
+
+make_listing_soup builds a partial tree for listing pages: only the <body>,
+with script, style and SVG blocks and comments cut out before parsing.
+Those make up most of a real listing page and are never looked at by the
+listing selectors.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    # Optional dependency
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+PARSER_BACKENDS = ["html.parser", "lxml", "selectolax"]
+DEFAULT_PARSER = "html.parser"
+
+# Blocks listing extraction never looks inside, and where each one ends.
+# Found with separate searches: a single lazy .*? pattern crawls through
+# hundreds of KB of inline CSS one character at a time. Tag names must end
+# at whitespace, "/" or ">", so custom elements such as <svg-icon> are kept.
+_SKIP_START = re.compile(r"<(?:(script|style|svg)(?=[\s/>])|!--)", re.IGNORECASE)
+_SKIP_END = {
+    "script": re.compile(r"</script\s*>", re.IGNORECASE),
+    "style": re.compile(r"</style\s*>", re.IGNORECASE),
+    "svg": re.compile(r"</svg\s*>", re.IGNORECASE),
+    None: re.compile(r"-->"),
+}
+_BODY_START = re.compile(r"<body(?=[\s/>])", re.IGNORECASE)
+
+
+def available_backends():
+    """Return the parser backends that can be used in this environment"""
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def make_soup(html, backend=DEFAULT_PARSER):
+    """
+    Parse HTML with the requested backend
+
+    Args:
+        html: HTML text to parse
+        backend: One of PARSER_BACKENDS
+
+    Returns:
+        A BeautifulSoup object, or a LexborNode adapter for selectolax
+    """
+    if backend == "selectolax":
+        if LexborHTMLParser is None:
+            raise ValueError("The selectolax backend requires: pip install selectolax")
+        return LexborNode(LexborHTMLParser(html).root)
+    if backend == "lxml" and not HAS_LXML:
+        raise ValueError("The lxml backend requires: pip install lxml")
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    return BeautifulSoup(html, backend)
+
+
+def make_listing_soup(html, backend=DEFAULT_PARSER):
+    """
+    Parse only the parts of a listing page that thread and next-page extraction use
+
+    The <head> and every script, style and SVG block are dropped before
+    parsing, so the tree holds just the visible body markup. The result
+    supports the same selectors as make_soup's, but not soup.title.
+
+    Args:
+        html: HTML text of a listing page
+        backend: One of PARSER_BACKENDS
+
+    Returns:
+        A BeautifulSoup object, or a LexborNode adapter for selectolax
+    """
+    html = _strip_skipped_blocks(html)
+    body = _BODY_START.search(html)
+    if body:
+        html = html[body.start():]
+    return make_soup(html, backend)
+
+
+def _strip_skipped_blocks(html):
+    """Remove script, style and SVG blocks and comments; an unterminated one runs to the end"""
+    parts = []
+    pos = 0
+    while True:
+        start = _SKIP_START.search(html, pos)
+        if not start:
+            break
+        parts.append(html[pos:start.start()])
+        tag = start.group(1).lower() if start.group(1) else None
+        end = _SKIP_END[tag].search(html, start.end())
+        if not end:
+            return "".join(parts)
+        pos = end.end()
+    parts.append(html[pos:])
+    return "".join(parts)
+
+
+class LexborNode:
+    """Wrap a selectolax node with the subset of the BeautifulSoup API the scraper uses"""
+
+    # Text inside these tags is not part of BeautifulSoup's get_text() output
+    _SKIP_TEXT_TAGS = ("script", "style", "template")
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector):
+        return [LexborNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+    def _strings(self):
+        for node in self._node.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            parent = node.parent
+            if parent is not None and parent.tag in self._SKIP_TEXT_TAGS:
+                continue
+            yield node.text_content or ""
+
+    def get_text(self, separator="", strip=False):
+        strings = self._strings()
+        if strip:
+            strings = (text.strip() for text in strings)
+            strings = (text for text in strings if text)
+        return separator.join(strings)
+
+    def get(self, attr, default=None):
+        value = self._node.attributes.get(attr)
+        if value is None:
+            return default
+        # BeautifulSoup treats class as a multi-valued attribute
+        return value.split() if attr == "class" else value
+
+    @property
+    def parent(self):
+        parent = self._node.parent
+        return LexborNode(parent) if parent is not None else None
+
+    @property
+    def title(self):
+        return self.select_one("title")
+
+    @property
+    def string(self):
+        # Like BeautifulSoup, only return text when the node has a single text child
+        children = list(self._node.iter(include_text=True))
+        if len(children) == 1 and children[0].tag == "-text":
+            return children[0].text_content
+        return None
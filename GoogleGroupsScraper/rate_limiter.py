@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Per-Host Token-Bucket Rate Limiter
+
+Replaces the fixed sleeps between requests. Each host gets a token bucket
+refilled at `rate` requests/second and holding up to `burst` tokens, so a
+healthy server is paced evenly instead of with worst-case pauses.
+
+The limiter adapts to the server: a 429 or 503 halves the host's rate and
+blocks the host until any Retry-After delay has passed, and each later
+success restores the rate a step at a time until it is back at the
+configured value.
+"""
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header into seconds
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _Bucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    def __init__(self, rate=1.0, burst=1, min_rate=0.05):
+        """
+        Args:
+            rate: Requests per second allowed per host (0 disables limiting)
+            burst: Number of requests that may be sent back to back
+            min_rate: Lowest rate the limiter backs off to after 429/503s
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = _Bucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def acquire(self, url):
+        """Block until a request to the URL's host is allowed"""
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+                if now >= bucket.blocked_until and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return
+                wait = max(bucket.blocked_until - now, (1 - bucket.tokens) / bucket.rate)
+                self.waited += wait
+            time.sleep(wait)
+
+    def backoff(self, url, retry_after=None):
+        """Slow down a host after a 429/503, honouring Retry-After if given"""
+        if self.rate <= 0:
+            if retry_after:
+                time.sleep(retry_after)
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+            bucket.tokens = 0
+            delay = retry_after if retry_after is not None else 1 / bucket.rate
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            self.throttled += 1
+        logging.warning(f"Server throttled {host}; waiting {delay:.1f}s and slowing to {bucket.rate:.2f} req/s")
+
+    def success(self, url):
+        """Recover a throttled host's rate after a successful request"""
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket.rate < self.rate:
+                bucket.rate = min(self.rate, bucket.rate + self.rate / 10)
+
+    def log_stats(self):
+        if self.throttled or self.waited:
+            logging.info(f"Rate limiter: waited {self.waited:.1f}s in total, throttled {self.throttled} time(s) by the server")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Request and Parse Timing Metrics
+
+Opt-in instrumentation for working out where a slow crawl spends its time.
+Every get_page call records its connect, time-to-first-byte and download
+times, bytes, final status and retry count; every parsed page records the
+time spent building the soup and matching selectors. At the end of a run
+p50/p95/p99 latencies are logged and all records can be written to a JSON
+metrics file.
+
+Connect time is only measured when the session was created with
+create_session(timed=True); on a reused keep-alive connection it is 0.
+Pages parsed in a --parse-workers process pool are not timed.
+
+Metrics file layout:
+    {
+        "summary": {"<metric>": {"count": N, "p50": s, "p95": s, "p99": s, "max": s}, ...},
+        "requests": [{"url", "status", "retries", "cached", "bytes", "connect", "ttfb", "download", "total"}, ...],
+        "pages": [{"url", "kind", "parse", "select"}, ...]
+    }
+"""
+
+import json
+import logging
+import math
+import threading
+
+REQUEST_TIMINGS = ("connect", "ttfb", "download", "total")
+PAGE_TIMINGS = ("parse", "select")
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of values (nearest rank), or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class RequestMetrics:
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON file to write the metrics to on save (None to only log them)
+        """
+        self.path = path
+        self.requests = []
+        self.pages = []
+        self._lock = threading.Lock()
+
+    def record_request(self, url, status, retries=0, cached=False, size=0,
+                       connect=0.0, ttfb=0.0, download=0.0, total=0.0):
+        """Record one get_page call (all times in seconds)"""
+        with self._lock:
+            self.requests.append({
+                "url": url,
+                "status": status,
+                "retries": retries,
+                "cached": cached,
+                "bytes": size,
+                "connect": connect,
+                "ttfb": ttfb,
+                "download": download,
+                "total": total,
+            })
+
+    def record_page(self, url, kind, parse, select):
+        """Record parsing of one page: kind is "listing" or "thread", times in seconds"""
+        with self._lock:
+            self.pages.append({"url": url, "kind": kind, "parse": parse, "select": select})
+
+    def summary(self):
+        """Return count and p50/p95/p99/max for every timing"""
+        with self._lock:
+            # Cache hits never touch the network, so they would only drag the percentiles down
+            network = [record for record in self.requests if not record["cached"]]
+            series = {f"request_{name}": [record[name] for record in network] for name in REQUEST_TIMINGS}
+            series.update({f"page_{name}": [record[name] for record in self.pages] for name in PAGE_TIMINGS})
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values) if values else None,
+            }
+            for name, values in series.items()
+        }
+
+    def log_stats(self):
+        if not self.requests and not self.pages:
+            return
+        with self._lock:
+            total_bytes = sum(record["bytes"] for record in self.requests)
+            retries = sum(record["retries"] for record in self.requests)
+            cached = sum(1 for record in self.requests if record["cached"])
+        logging.info(
+            f"Metrics: {len(self.requests)} requests ({cached} from cache, {retries} retries), "
+            f"{total_bytes / 1024:.0f} KB downloaded, {len(self.pages)} pages parsed"
+        )
+        for name, stats in self.summary().items():
+            if stats["count"]:
+                logging.info(
+                    f"  {name:<17} p50 {stats['p50'] * 1000:8.1f} ms   p95 {stats['p95'] * 1000:8.1f} ms   "
+                    f"p99 {stats['p99'] * 1000:8.1f} ms   max {stats['max'] * 1000:8.1f} ms   (n={stats['count']})"
+                )
+
+    def save(self):
+        """Write the summary and all records to the metrics file"""
+        if not self.path:
+            return
+        data = {"summary": self.summary()}
+        with self._lock:
+            data["requests"] = list(self.requests)
+            data["pages"] = list(self.pages)
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            logging.info(f"Saved metrics to {self.path}")
+        except OSError as e:
+            logging.warning(f"Failed to save metrics {self.path}: {e}")
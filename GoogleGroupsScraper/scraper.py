@@ -1,12 +1,64 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import logging
 import sys
 import re
 import json
 import argparse
+import queue
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from urllib.parse import urlparse, urlunparse
+from archive import ThreadArchive
+from browser_login import BrowserLogin, is_login_redirect, set_session_cookies
+from connection_pool import create_session, log_connection_stats, take_connect_time
+from http_cache import ResponseCache
+from rate_limiter import RateLimiter, parse_retry_after
+from request_metrics import RequestMetrics
+from parsers import DEFAULT_PARSER, PARSER_BACKENDS, make_listing_soup, make_soup
+from selector_memo import SelectorMemo
+from sync_state import SyncWatermark
+from thread_index import ThreadIndex
+
+# Status codes that mean the server wants us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Host scraped unless --base-url points somewhere else (e.g. standin_server.py)
+DEFAULT_BASE_URL = "https://groups.google.com"
+
+def url_origin(url):
+    """Return the scheme://host[:port] part of an absolute URL, or None for a relative one"""
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+def rebase_url(url, base_url=None):
+    """
+    Resolve a Google Groups URL or path against a base URL
+    
+    Absolute URLs keep their path and query but move to base_url's host, so
+    the same group and thread URLs can be replayed against a stand-in
+    server. Without base_url, absolute URLs are returned unchanged and paths
+    resolve against DEFAULT_BASE_URL.
+    
+    Args:
+        url: Absolute URL or path such as /g/groupname
+        base_url: scheme://host[:port] to move the URL to
+        
+    Returns:
+        str: Absolute URL
+    """
+    if base_url is None:
+        if url_origin(url):
+            return url
+        base_url = DEFAULT_BASE_URL
+    base = urlparse(base_url)
+    return urlunparse(urlparse(url)._replace(scheme=base.scheme, netloc=base.netloc))
 
 # Configure logging
 logging.basicConfig(
@@ -16,21 +68,84 @@ logging.basicConfig(
 )
 
 class GoogleGroupsScraper:
-    def __init__(self, group_url):
-        self.group_url = group_url
+    def __init__(self, group_url, workers=1, max_per_host=4, cache=None, parser=DEFAULT_PARSER,
+                 selector_cache=None, rate_limiter=None, session=None, parse_workers=0, parse_pool=None, watermark=None,
+                 thread_index=None, metrics=None, base_url=None, reauthenticate=None):
+        # Host that relative links resolve against; defaults to the group URL's own host
+        self.base_url = (base_url or (group_url and url_origin(group_url)) or DEFAULT_BASE_URL).rstrip("/")
+        self.group_url = rebase_url(group_url, base_url) if group_url else group_url
+        # Optional RequestMetrics; when set, request and parse timings are recorded
+        self.metrics = metrics
+        # Optional callable(session) -> bool that refreshes the session's cookies
+        # (e.g. BrowserLogin.refresh) when a request is sent to the sign-in page
+        self.reauthenticate = reauthenticate
+        # Optional ThreadIndex shared across iter_group runs (and scrapers); without one,
+        # each iter_group run drops duplicate links with an index of its own
+        self.thread_index = thread_index
+        # Optional SyncWatermark; when set, only new or changed threads are listed
+        self.watermark = watermark
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.cache = cache
+        self.parser = parser
+        self.selector_memo = SelectorMemo(selector_cache, layout_key=group_url)
+        self.workers = max(1, workers)
+        self.max_per_host = max(1, max_per_host)
+        # Optional process pool that parses thread HTML off the fetching thread
+        self.parse_workers = parse_workers
+        self.parse_pool = parse_pool
+        self._owns_parse_pool = False
+        if parse_pool is None and parse_workers > 0:
+            self.parse_pool = create_parse_pool(parse_workers, parser)
+            self._owns_parse_pool = True
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        self.session = requests.Session()
+        # Pass a shared session to reuse one connection pool (and cookies) across scrapers;
+        # size the pool so concurrent workers don't discard connections
+        self.session = session or create_session(pool_size=max(10, self.workers), timed=metrics is not None)
+    
+    def log_run_stats(self):
+        """Log end-of-run statistics and persist learned selectors"""
+        self.selector_memo.log_stats()
+        self.selector_memo.save()
+        self.rate_limiter.log_stats()
+        if self.thread_index:
+            self.thread_index.log_stats()
+        if self.watermark:
+            self.watermark.log_stats()
+        log_connection_stats(self.session)
+        if self.cache:
+            self.cache.log_stats()
+        if self.metrics:
+            self.metrics.log_stats()
+            self.metrics.save()
+    
+    def close(self):
+        """Shut down the parse pool if this scraper created it"""
+        if self._owns_parse_pool:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+            self._owns_parse_pool = False
+    
+    def _host_slot(self, url):
+        """Return the semaphore capping concurrent requests to the URL's host"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
     
     def authenticate_with_cookies(self, cookies_file):
         """
         Set authentication cookies from a JSON file
         
         Args:
-            cookies_file: Path to JSON file containing cookies
+            cookies_file: Path to JSON file containing cookies, either a name -> value
+                object or a Playwright cookie list as saved by browser_scraper.py
         
         Returns:
             bool: True if cookies were loaded successfully, False otherwise
@@ -39,10 +154,9 @@ class GoogleGroupsScraper:
             with open(cookies_file, 'r') as f:
                 cookies = json.load(f)
                 
-            for name, value in cookies.items():
-                self.session.cookies.set(name, value, domain='.google.com')
+            count = set_session_cookies(self.session, cookies)
             
-            logging.info(f"Loaded {len(cookies)} cookies from {cookies_file}")
+            logging.info(f"Loaded {count} cookies from {cookies_file}")
             return True
         except Exception as e:
             logging.error(f"Failed to load cookies: {e}")
@@ -50,11 +164,68 @@ class GoogleGroupsScraper:
     
     def get_page(self, url):
         """Fetch a page with error handling and retries"""
+        start_time = time.perf_counter()
+        identity = None
+        headers = self.headers
+        if self.cache:
+            identity = self.cache.cookie_identity(self.session.cookies)
+            cached = self.cache.fresh_response(url, identity)
+            if cached:
+                self._record_request(url, start_time, cached.status_code, cached=True)
+                return cached
+            # Counted whether or not the fetch ends up stored or revalidated
+            self.cache.record_miss()
+            headers = dict(self.headers, **self.cache.conditional_headers(url, identity))
+        
         max_retries = 3
+        status = None
+        timings = None
+        reauthenticated = False
         for attempt in range(max_retries):
+            self.rate_limiter.acquire(url)
             try:
-                response = self.session.get(url, headers=self.headers, timeout=30)
+                with self._host_slot(url):
+                    take_connect_time()
+                    request_start = time.perf_counter()
+                    response = self.session.get(url, headers=headers, timeout=30, stream=True)
+                    headers_received = time.perf_counter()
+                    # Read the body while still holding the host slot
+                    size = len(response.content)
+                    connect_time = take_connect_time()
+                    timings = (connect_time, headers_received - request_start - connect_time,
+                               time.perf_counter() - headers_received, size)
+                status = response.status_code
+                if response.status_code in THROTTLE_STATUS_CODES:
+                    # The limiter holds back every request to this host until Retry-After has passed
+                    self.rate_limiter.backoff(url, parse_retry_after(response.headers.get("Retry-After")))
+                    if attempt < max_retries - 1:
+                        continue
+                if (self.reauthenticate and not reauthenticated and attempt < max_retries - 1
+                        and is_login_redirect(response) and self.reauthenticate(self.session)):
+                    # Retry once with the new cookies, which also change the cache identity
+                    reauthenticated = True
+                    if self.cache:
+                        identity = self.cache.cookie_identity(self.session.cookies)
+                        headers = dict(self.headers, **self.cache.conditional_headers(url, identity))
+                    continue
+                if is_login_redirect(response):
+                    # The sign-in page is not the requested page; never return or cache it
+                    if reauthenticated:
+                        logging.error(f"Still redirected to the sign-in page for {url} after signing in again")
+                    else:
+                        logging.error(f"Redirected to the sign-in page for {url}; the session is not signed in")
+                    self._record_request(url, start_time, status, attempt, timings)
+                    return None
+                if self.cache and response.status_code == 304:
+                    cached = self.cache.revalidate(url, identity)
+                    if cached:
+                        self._record_request(url, start_time, 304, attempt, timings)
+                        return cached
                 response.raise_for_status()
+                self.rate_limiter.success(url)
+                if self.cache:
+                    self.cache.store(url, identity, response)
+                self._record_request(url, start_time, status, attempt, timings)
                 return response
             except requests.exceptions.RequestException as e:
                 logging.error(f"Request failed: {e}")
@@ -64,10 +235,28 @@ class GoogleGroupsScraper:
                     time.sleep(sleep_time)
                 else:
                     logging.error("Max retries reached. Giving up.")
+                    self._record_request(url, start_time, status, attempt, timings)
                     return None
     
+    def _record_request(self, url, start_time, status, attempt=0, timings=None, cached=False):
+        """Record a get_page call in the metrics; timings are the last attempt's (connect, ttfb, download, bytes)"""
+        if not self.metrics:
+            return
+        connect, ttfb, download, size = timings or (0.0, 0.0, 0.0, 0)
+        self.metrics.record_request(url, status, retries=attempt, cached=cached, size=size,
+                                    connect=connect, ttfb=ttfb, download=download,
+                                    total=time.perf_counter() - start_time)
+    
     def extract_thread_info(self, soup):
-        """Extract thread titles and links from the page"""
+        """Extract thread titles and links from the page, dropping duplicate links to the same thread"""
+        return self._new_threads(self.select_thread_records(soup), ThreadIndex())
+    
+    @staticmethod
+    def _new_threads(records, thread_index):
+        return [record for record in records if thread_index.add(record["link"])]
+    
+    def select_thread_records(self, soup):
+        """Extract every thread title and link on the page with CSS selectors, duplicates included"""
         threads = []
         
         # Try different selectors as Google Groups structure might change
@@ -81,60 +270,91 @@ class GoogleGroupsScraper:
             "a[href*='/c/']", # Thread links format
         ]
         
-        for selector in selectors:
-            items = soup.select(selector)
-            if items:
-                logging.info(f"Found {len(items)} threads using selector: {selector}")
-                for item in items:
-                    title = item.get_text(strip=True)
-                    link = item.get('href')
-                    if link and not link.startswith('http'):
-                        link = f"https://groups.google.com{link}"
+        selector, items = self.selector_memo.match(soup, "thread_list", selectors)
+        if items:
+            logging.info(f"Found {len(items)} threads using selector: {selector}")
+            for item in items:
+                title = item.get_text(strip=True)
+                link = item.get('href')
+                if link and not link.startswith('http'):
+                    link = f"{self.base_url}{link}"
+                
+                # Try to find author and date information if available
+                author = None
+                date = None
+                
+                # Look for parent container that might have author/date info
+                parent = item.parent
+                if parent:
+                    # Look for author info
+                    author_elem = parent.select_one(".author, span[role='author'], .bZI0O")
+                    if author_elem:
+                        author = author_elem.get_text(strip=True)
                     
-                    # Try to find author and date information if available
-                    author = None
-                    date = None
+                    # Look for date info
+                    date_elem = parent.select_one(".date, span[role='date'], .wJMDsd")
+                    if date_elem:
+                        date = date_elem.get_text(strip=True)
+                
+                if title:
+                    thread_info = {
+                        "title": title,
+                        "link": link
+                    }
                     
-                    # Look for parent container that might have author/date info
-                    parent = item.parent
-                    if parent:
-                        # Look for author info
-                        author_elem = parent.select_one(".author, span[role='author'], .bZI0O")
-                        if author_elem:
-                            author = author_elem.get_text(strip=True)
-                        
-                        # Look for date info
-                        date_elem = parent.select_one(".date, span[role='date'], .wJMDsd")
-                        if date_elem:
-                            date = date_elem.get_text(strip=True)
+                    if author:
+                        thread_info["author"] = author
                     
-                    if title:
-                        thread_info = {
-                            "title": title,
-                            "link": link
-                        }
-                        
-                        if author:
-                            thread_info["author"] = author
+                    if date:
+                        thread_info["date"] = date
                         
-                        if date:
-                            thread_info["date"] = date
-                            
-                        threads.append(thread_info)
-                return threads
+                    threads.append(thread_info)
+            return threads
         
         logging.warning("No threads found with any selector.")
         return threads
     
     def extract_next_page(self, soup):
         """Extract the next page link if available"""
+        return self._absolute_link(self._next_page_href(soup))
+    
+    def _next_page_href(self, soup):
         next_links = soup.select("a.next-page-link, a[aria-label='Next page'], a.ZIKj2d")
         if next_links:
-            next_link = next_links[0].get('href')
-            if next_link and not next_link.startswith('http'):
-                next_link = f"https://groups.google.com{next_link}"
-            return next_link
+            return next_links[0].get('href')
         return None
+    
+    def _absolute_link(self, link):
+        if link and not link.startswith('http'):
+            link = f"{self.base_url}{link}"
+        return link
+    
+    def extract_listing(self, html, page_url=None, thread_index=None):
+        """
+        Extract new threads and the next page link from a listing page
+        
+        Parses only the page body (without scripts and styles) and matches
+        CSS selectors.
+        
+        Args:
+            html: Raw HTML of the listing page
+            page_url: URL the page was fetched from
+            thread_index: ThreadIndex of threads listed on earlier pages (None for this page only)
+        
+        Returns:
+            tuple: (threads not listed before, next page URL or None)
+        """
+        if thread_index is None:
+            thread_index = ThreadIndex()
+        parse_start = time.perf_counter()
+        soup = make_listing_soup(html, self.parser)
+        parse_time = time.perf_counter() - parse_start
+        self.selector_memo.take_match_time()
+        records = self.select_thread_records(soup)
+        next_href = self._next_page_href(soup)
+        if self.metrics:
+            self.metrics.record_page(page_url, "listing", parse_time, self.selector_memo.take_match_time())
+        return self._new_threads(records, thread_index), self._absolute_link(next_href)
 
     def extract_thread_content(self, thread_url):
         """
@@ -146,23 +366,66 @@ class GoogleGroupsScraper:
         Returns:
             dict: Thread details including posts
         """
+        html = self.fetch_thread_html(thread_url)
+        if html is None:
+            return None
+        
+        if self.parse_pool:
+            return self.parse_pool.submit(_parse_in_worker, html, thread_url).result()
+        return self.parse_thread_content(html, thread_url)
+    
+    def fetch_thread_html(self, thread_url):
+        """Fetch the raw HTML of a thread page, or None if the request failed"""
         logging.info(f"Extracting content from thread: {thread_url}")
         
         response = self.get_page(thread_url)
         if not response:
             logging.error(f"Failed to fetch thread: {thread_url}")
             return None
+        return response.text
+    
+    def submit_thread_content(self, thread_url):
+        """
+        Fetch a thread now and return a Future for its parsed content
+        
+        With a parse pool the HTML is parsed in another process, so the caller
+        can fetch the next thread meanwhile. Without one the future is already
+        resolved when it is returned.
+        """
+        if not self.parse_pool:
+            future = Future()
+            future.set_result(self.extract_thread_content(thread_url))
+            return future
+        
+        html = self.fetch_thread_html(thread_url)
+        if html is None:
+            future = Future()
+            future.set_result(None)
+            return future
+        return self.parse_pool.submit(_parse_in_worker, html, thread_url)
+    
+    def parse_thread_content(self, html, thread_url):
+        """
+        Parse the HTML of a thread page
+        
+        Args:
+            html: Raw HTML of the thread page
+            thread_url: URL the page was fetched from
             
-        soup = BeautifulSoup(response.text, "html.parser")
+        Returns:
+            dict: Thread details including posts
+        """
+        parse_start = time.perf_counter()
+        soup = make_soup(html, self.parser)
+        parse_time = time.perf_counter() - parse_start
+        self.selector_memo.take_match_time()
         
         # Extract thread title
         title_selectors = ["h1.thread-title", "h2.thread-title", "h1.iUvsJ", "h2.iUvsJ"]
         title = None
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                break
+        _, title_elem = self.selector_memo.match(soup, "thread_title", title_selectors, select_one=True)
+        if title_elem:
+            title = title_elem.get_text(strip=True)
                 
         if not title:
             # Try to find the title in the page title
@@ -182,68 +445,69 @@ class GoogleGroupsScraper:
             "div[role='article']"
         ]
         
-        found_posts = False
-        for selector in post_selectors:
-            post_elements = soup.select(selector)
-            if post_elements:
-                logging.info(f"Found {len(post_elements)} posts using selector: {selector}")
-                found_posts = True
+        selector, post_elements = self.selector_memo.match(soup, "post", post_selectors)
+        found_posts = bool(post_elements)
+        if found_posts:
+            logging.info(f"Found {len(post_elements)} posts using selector: {selector}")
+            
+            author_selectors = [".author", "span[role='author']", ".UXbBWb", ".PBuZLb"]
+            date_selectors = [".date", "span[role='date']", ".ZRWfre", ".nMTYKd"]
+            content_selectors = [".content", ".message-body", ".tlFcqe", ".Xs9Rsd"]
+            
+            for post_elem in post_elements:
+                post = {}
                 
-                for post_elem in post_elements:
-                    post = {}
-                    
-                    # Extract author
-                    author_selectors = [".author", "span[role='author']", ".UXbBWb", ".PBuZLb"]
-                    for author_selector in author_selectors:
-                        author_elem = post_elem.select_one(author_selector)
-                        if author_elem:
-                            post["author"] = author_elem.get_text(strip=True)
-                            break
-                    
-                    # Extract date
-                    date_selectors = [".date", "span[role='date']", ".ZRWfre", ".nMTYKd"]
-                    for date_selector in date_selectors:
-                        date_elem = post_elem.select_one(date_selector)
-                        if date_elem:
-                            post["date"] = date_elem.get_text(strip=True)
-                            break
-                    
-                    # Extract content
-                    content_selectors = [".content", ".message-body", ".tlFcqe", ".Xs9Rsd"]
-                    for content_selector in content_selectors:
-                        content_elem = post_elem.select_one(content_selector)
-                        if content_elem:
-                            # Preserve line breaks in content
-                            post["content"] = "\n".join([line.strip() for line in content_elem.get_text().split("\n") if line.strip()])
-                            break
-                    
-                    # If we couldn't find content with selectors, try getting all text from the post
-                    if "content" not in post:
-                        # Filter out author and date text if we've found them
-                        full_text = post_elem.get_text(strip=True)
-                        if "author" in post:
-                            full_text = full_text.replace(post["author"], "", 1)
-                        if "date" in post:
-                            full_text = full_text.replace(post["date"], "", 1)
-                        post["content"] = full_text.strip()
-                    
-                    if post:
-                        posts.append(post)
+                # Extract author
+                _, author_elem = self.selector_memo.match(post_elem, "post_author", author_selectors, select_one=True)
+                if author_elem:
+                    post["author"] = author_elem.get_text(strip=True)
+                
+                # Extract date
+                _, date_elem = self.selector_memo.match(post_elem, "post_date", date_selectors, select_one=True)
+                if date_elem:
+                    post["date"] = date_elem.get_text(strip=True)
+                
+                # Extract content
+                _, content_elem = self.selector_memo.match(post_elem, "post_content", content_selectors, select_one=True)
+                if content_elem:
+                    # Preserve line breaks in content
+                    post["content"] = "\n".join([line.strip() for line in content_elem.get_text().split("\n") if line.strip()])
                 
-                break  # Found posts with this selector, no need to try others
+                # If we couldn't find content with selectors, try getting all text from the post
+                if "content" not in post:
+                    # Filter out author and date text if we've found them
+                    full_text = post_elem.get_text(strip=True)
+                    if "author" in post:
+                        full_text = full_text.replace(post["author"], "", 1)
+                    if "date" in post:
+                        full_text = full_text.replace(post["date"], "", 1)
+                    post["content"] = full_text.strip()
+                
+                if post:
+                    posts.append(post)
         
         if not found_posts:
             logging.warning(f"No posts found in thread: {thread_url}")
         
+        if self.metrics:
+            self.metrics.record_page(thread_url, "thread", parse_time, self.selector_memo.take_match_time())
+        
         return {
             "url": thread_url,
             "title": title,
             "posts": posts
         }
     
-    def scrape_group(self, max_pages=5):
-        """Scrape the Google Group for threads, with pagination support"""
-        all_threads = []
+    def iter_group(self, max_pages=5):
+        """
+        Yield threads from the Google Group page by page, following pagination
+        
+        With a watermark set, only new or changed threads are yielded and
+        pagination stops at the first page that holds nothing new. Duplicate
+        links are dropped across the pages of this run, or across runs if the
+        scraper was given a shared thread_index.
+        """
+        thread_index = self.thread_index or ThreadIndex()
         current_url = self.group_url
         page_count = 0
         
@@ -254,22 +518,113 @@ class GoogleGroupsScraper:
             if not response:
                 break
                 
-            soup = BeautifulSoup(response.text, "html.parser")
-            threads = self.extract_thread_info(soup)
-            all_threads.extend(threads)
+            threads, next_page = self.extract_listing(response.text, current_url, thread_index)
+            
+            # Release the page before handing threads downstream
+            del response
+            
+            if self.watermark:
+                fresh = self.watermark.observe(threads)
+                yield from fresh
+                if self.watermark.can_stop(threads, fresh):
+                    logging.info("Listing page holds only known threads; stopping pagination")
+                    break
+            else:
+                yield from threads
             
             # Check for next page
-            next_page = self.extract_next_page(soup)
             if not next_page or next_page == current_url:
+                if self.watermark:
+                    self.watermark.listing_complete()
                 break
                 
             current_url = next_page
             page_count += 1
+        
+        # A shared index is logged by log_run_stats instead
+        if thread_index is not self.thread_index:
+            thread_index.log_stats()
+    
+    def iter_group_prefetched(self, max_pages=5, queue_size=100):
+        """
+        Yield threads like iter_group, but paginate on a background thread
+        
+        Listing page N+1 is fetched while the caller is still working on the
+        threads from page N. The queue is bounded so a slow consumer holds
+        pagination back instead of buffering the whole group in memory.
+        """
+        items = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        
+        def put(item):
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for thread in self.iter_group(max_pages=max_pages):
+                    if not put(("thread", thread)):
+                        return
+            except Exception as e:
+                put(("error", e))
+            finally:
+                put(("done", None))
+        
+        producer = threading.Thread(target=produce, name="listing-producer", daemon=True)
+        producer.start()
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            stop.set()
+    
+    def scrape_group(self, max_pages=5):
+        """Scrape the Google Group for threads, with pagination support"""
+        return list(self.iter_group(max_pages=max_pages))
+    
+    def iter_thread_contents(self, threads, max_threads=None):
+        """
+        Yield content from multiple threads as each one is scraped
+        
+        Args:
+            threads: Iterable of thread dictionaries with 'link' key
+            max_threads: Maximum number of threads to scrape (None for all)
             
-            # Be nice to the server
-            time.sleep(2)
+        Yields:
+            dict: Thread details including posts, in the same order as threads
+        """
+        if max_threads:
+            threads = islice(threads, max_threads)
+            
+        logging.info(f"Scraping thread contents with {self.workers} worker(s)")
+        start_time = time.monotonic()
+        scraped = 0
+        
+        if self.workers > 1:
+            thread_contents = self._iter_thread_contents_concurrent(threads)
+        else:
+            thread_contents = self._iter_thread_contents_serial(threads)
         
-        return all_threads
+        for thread_content in thread_contents:
+            scraped += 1
+            if self.watermark:
+                self.watermark.confirm(thread_content["url"])
+            yield thread_content
+        
+        elapsed = time.monotonic() - start_time
+        if elapsed > 0:
+            logging.info(f"Scraped {scraped} threads in {elapsed:.1f}s "
+                         f"({scraped / elapsed:.2f} threads/sec)")
     
     def scrape_thread_contents(self, threads, max_threads=None):
         """
@@ -280,32 +635,202 @@ class GoogleGroupsScraper:
             max_threads: Maximum number of threads to scrape (None for all)
             
         Returns:
-            list: Thread details including posts
+            list: Thread details including posts, in the same order as threads
         """
-        thread_contents = []
-        
-        if max_threads:
-            threads = threads[:max_threads]
-            
-        total_threads = len(threads)
-        logging.info(f"Scraping content from {total_threads} threads")
+        return list(self.iter_thread_contents(threads, max_threads=max_threads))
+    
+    def _iter_thread_contents_serial(self, threads):
+        """Fetch threads one at a time, parsing up to parse_workers of them in the background"""
+        pending = deque()
         
         for i, thread in enumerate(threads, 1):
-            logging.info(f"Scraping thread {i}/{total_threads}: {thread['title']}")
+            logging.info(f"Scraping thread {i}: {thread['title']}")
             
             if 'link' not in thread or not thread['link']:
                 logging.warning(f"Thread has no link, skipping: {thread['title']}")
                 continue
                 
-            thread_content = self.extract_thread_content(thread['link'])
+            pending.append(self.submit_thread_content(thread['link']))
+            while len(pending) > self.parse_workers:
+                thread_content = self._collect_thread_content(pending.popleft())
+                if thread_content:
+                    yield thread_content
+        
+        while pending:
+            thread_content = self._collect_thread_content(pending.popleft())
             if thread_content:
-                thread_contents.append(thread_content)
+                yield thread_content
+    
+    def _iter_thread_contents_concurrent(self, threads):
+        """Scrape threads on a worker pool, yielding results in input order"""
+        # Bound the number of in-flight threads so memory stays flat
+        max_pending = self.workers * 2
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for i, thread in enumerate(threads, 1):
+                if 'link' not in thread or not thread['link']:
+                    logging.warning(f"Thread has no link, skipping: {thread['title']}")
+                    continue
+                logging.info(f"Queueing thread {i}: {thread['title']}")
+                pending.append(executor.submit(self.extract_thread_content, thread['link']))
                 
-            # Be nice to the server
-            if i < total_threads:
-                time.sleep(1)
+                # Collect in submission order so output matches the serial path
+                while len(pending) >= max_pending:
+                    thread_content = self._collect_thread_content(pending.popleft())
+                    if thread_content:
+                        yield thread_content
+            
+            while pending:
+                thread_content = self._collect_thread_content(pending.popleft())
+                if thread_content:
+                    yield thread_content
+    
+    def _collect_thread_content(self, future):
+        try:
+            return future.result()
+        except Exception as e:
+            logging.error(f"Thread extraction failed: {e}")
+            return None
+
+# Per-process scraper used by parse pool workers
+_parse_worker_scraper = None
+
+def _init_parse_worker(parser):
+    global _parse_worker_scraper
+    _parse_worker_scraper = GoogleGroupsScraper(None, parser=parser)
+
+def _parse_in_worker(html, thread_url):
+    return _parse_worker_scraper.parse_thread_content(html, thread_url)
+
+def create_parse_pool(workers, parser=DEFAULT_PARSER):
+    """
+    Create a process pool that parses thread HTML with parse_thread_content
+    
+    Parsing holds the GIL, so moving it to other processes lets the fetching
+    thread keep downloading while other cores parse.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker, initargs=(parser,))
+
+def write_jsonl_record(f, record):
+    """Write one JSON Lines record and flush it so partial results survive interruptions"""
+    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    f.flush()
+
+def stream_group_to_jsonl(scraper, output_path, max_pages, content=False, max_threads=None, pipeline=False, archive=None):
+    """
+    Scrape a group and write threads and thread contents to a JSON Lines file as they are produced
+    
+    Each line is an object with a "type" of "group", "thread" or "thread_content".
+    With pipeline=True, listing pages are fetched on a background thread while
+    thread contents are being scraped. Thread contents are also written to
+    archive (a ThreadArchive) if one is given.
+    
+    Returns:
+        tuple: (number of threads, number of thread contents) written
+    """
+    counts = {"threads": 0, "thread_contents": 0}
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write_jsonl_record(f, {"type": "group", "group_url": scraper.group_url})
+        
+        def listed_threads():
+            if pipeline:
+                group_threads = scraper.iter_group_prefetched(max_pages=max_pages)
+            else:
+                group_threads = scraper.iter_group(max_pages=max_pages)
+            for thread in group_threads:
+                write_jsonl_record(f, {"type": "thread", **thread})
+                counts["threads"] += 1
+                yield thread
+        
+        threads = listed_threads()
+        if content:
+            for thread_content in scraper.iter_thread_contents(threads, max_threads=max_threads):
+                write_jsonl_record(f, {"type": "thread_content", **thread_content})
+                if archive:
+                    archive.add_thread(thread_content, group_url=scraper.group_url)
+                counts["thread_contents"] += 1
         
-        return thread_contents
+        # Finish paginating past the content limit so the thread list is complete
+        for _ in threads:
+            pass
+    
+    return counts["threads"], counts["thread_contents"]
+
+def add_cache_arguments(parser):
+    """Add the response cache options shared by all command-line entry points"""
+    parser.add_argument("--cache-dir", help="Directory for the persistent HTTP response cache (disabled if omitted)")
+    parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds to serve cached pages without revalidation (default: 3600)")
+    parser.add_argument("--cache-max-mb", type=int, default=500, help="Maximum cache size in MB before LRU eviction (default: 500)")
+    parser.add_argument("--selector-cache", help="JSON file to persist learned page-layout selectors between runs")
+
+def add_rate_arguments(parser, default_rate=1.0):
+    """Add the request pacing options shared by all command-line entry points"""
+    parser.add_argument("--rate", type=float, default=default_rate,
+                        help=f"Maximum requests per second per host, 0 for no limit (default: {default_rate:.3g})")
+    parser.add_argument("--burst", type=int, default=1, help="Requests allowed back to back before pacing applies (default: 1)")
+
+def add_pool_arguments(parser):
+    """Add the connection pool options shared by command-line entry points"""
+    parser.add_argument("--pool-size", type=int, default=10, help="HTTP connections kept open per host (default: 10)")
+    parser.add_argument("--no-keep-alive", dest="keep_alive", action="store_false",
+                        help="Close connections after each request instead of reusing them")
+
+def session_from_args(args, workers=1):
+    """Build a shared requests.Session from parsed arguments"""
+    return create_session(pool_size=max(args.pool_size, workers), keep_alive=args.keep_alive,
+                          timed=bool(args.metrics))
+
+def add_base_url_argument(parser):
+    """Add the option that points command-line entry points at another Google Groups host"""
+    parser.add_argument("--base-url", help=f"Scrape this host instead of {DEFAULT_BASE_URL}, e.g. a local "
+                                           "standin_server.py; group and thread URLs are moved onto it")
+
+def add_browser_login_arguments(parser):
+    """Add the options that sign in with a browser before scraping over HTTP"""
+    parser.add_argument("--browser-login", action="store_true",
+                        help="Sign in with Playwright, then scrape over HTTP with the browser's cookies; "
+                             "signs in again if the session expires (requires playwright)")
+    parser.add_argument("--email", help="Google account email for --browser-login (default: GOOGLE_EMAIL)")
+    parser.add_argument("--password", help="Google account password for --browser-login (default: GOOGLE_PASSWORD)")
+    parser.add_argument("--login-cookies", default="cookies/google_cookies.json",
+                        help="Browser cookie file --browser-login tries first and updates "
+                             "(default: cookies/google_cookies.json)")
+    parser.add_argument("--visible", action="store_true", help="Show the browser window during --browser-login")
+
+def browser_login_from_args(args):
+    """Build a BrowserLogin from parsed arguments, or None if --browser-login wasn't given"""
+    if not args.browser_login:
+        return None
+    return BrowserLogin(args.email, args.password, args.login_cookies, headless=not args.visible)
+
+def add_metrics_argument(parser):
+    """Add the timing instrumentation option shared by command-line entry points"""
+    parser.add_argument("--metrics", help="Record per-request and per-page timings, log p50/p95/p99 "
+                                          "and write all measurements to this JSON file")
+
+def metrics_from_args(args):
+    """Build a RequestMetrics from parsed arguments, or None if instrumentation is disabled"""
+    return RequestMetrics(args.metrics) if args.metrics else None
+
+def rate_limiter_from_args(args, workers=1):
+    """Build the shared RateLimiter from parsed arguments"""
+    if workers > 1 and 0 < args.rate < workers:
+        logging.warning(f"--rate {args.rate:g} allows at most {args.rate:g} requests/s per host across all "
+                        f"{workers} workers; raise --rate (0 for no limit) to benefit from concurrency")
+    return RateLimiter(rate=args.rate, burst=args.burst)
+
+def add_parser_argument(parser):
+    """Add the HTML parser backend option shared by all command-line entry points"""
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default=DEFAULT_PARSER,
+                        help=f"HTML parser backend (default: {DEFAULT_PARSER})")
+
+def cache_from_args(args):
+    """Build a ResponseCache from parsed arguments, or None if caching is disabled"""
+    if not args.cache_dir:
+        return None
+    return ResponseCache(args.cache_dir, ttl=args.cache_ttl, max_bytes=args.cache_max_mb * 1024 * 1024)
 
 def main():
     parser = argparse.ArgumentParser(description="Scrape Google Groups for threads and content")
@@ -315,36 +840,127 @@ def main():
     parser.add_argument("--cookies", help="Path to JSON file with authentication cookies for private groups")
     parser.add_argument("--output", help="Path to save the results as JSON")
     parser.add_argument("--content", action="store_true", help="Scrape thread contents in addition to thread list")
+    parser.add_argument("--stream", action="store_true", help="Write results to --output as JSON Lines while scraping")
+    parser.add_argument("--archive", help="SQLite database to archive thread contents in (searchable with archive.py)")
+    parser.add_argument("--sync-state", help="JSON file with per-group sync watermarks; only new or changed threads are scraped")
+    parser.add_argument("--no-pipeline", dest="pipeline", action="store_false",
+                        help="With --content, finish paginating before scraping thread contents")
+    parser.add_argument("--workers", type=int, default=1, help="Number of threads to fetch concurrently (default: 1)")
+    parser.add_argument("--per-host", type=int, default=4, help="Maximum concurrent requests per host (default: 4)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processes to parse thread pages in, 0 to parse inline (default: 0)")
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    add_rate_arguments(parser)
+    add_pool_arguments(parser)
+    add_metrics_argument(parser)
+    add_base_url_argument(parser)
+    add_browser_login_arguments(parser)
     
     args = parser.parse_args()
     
-    scraper = GoogleGroupsScraper(args.group_url)
+    archive = None
+    if args.archive:
+        if not args.content:
+            logging.error("--archive requires --content")
+            return
+        try:
+            archive = ThreadArchive(args.archive)
+        except (sqlite3.Error, ValueError) as e:
+            logging.error(f"Failed to open archive {args.archive}: {e}")
+            return
+    
+    cache = cache_from_args(args)
+    scraper = GoogleGroupsScraper(args.group_url, workers=args.workers, max_per_host=args.per_host,
+                                  cache=cache, parser=args.parser, selector_cache=args.selector_cache,
+                                  rate_limiter=rate_limiter_from_args(args, workers=args.workers),
+                                  session=session_from_args(args, workers=args.workers),
+                                  parse_workers=args.parse_workers,
+                                  watermark=SyncWatermark(args.sync_state, rebase_url(args.group_url, args.base_url),
+                                                          require_content=args.content)
+                                  if args.sync_state else None,
+                                  metrics=metrics_from_args(args), base_url=args.base_url)
     
+    try:
+        scrape_and_report(scraper, args, archive)
+    finally:
+        # Every exit path logs the run and writes --metrics and --selector-cache
+        if archive:
+            archive.log_stats()
+            archive.close()
+        scraper.log_run_stats()
+        scraper.close()
+
+def scrape_and_report(scraper, args, archive=None):
+    """Run the scrape main() configured and save or print the results"""
     # Authenticate with cookies if provided
     if args.cookies:
         if not scraper.authenticate_with_cookies(args.cookies):
             logging.error("Failed to authenticate with provided cookies. Exiting.")
             return
     
-    # Scrape threads
-    threads = scraper.scrape_group(max_pages=args.pages)
+    browser_login = browser_login_from_args(args)
+    if browser_login:
+        if not browser_login.login(scraper.session):
+            logging.error("Browser login failed. Exiting.")
+            return
+        scraper.reauthenticate = browser_login.refresh
+    
+    if args.stream:
+        if not args.output:
+            logging.error("--stream requires --output")
+            return
+        thread_count, content_count = stream_group_to_jsonl(
+            scraper, args.output, args.pages, content=args.content, max_threads=args.threads,
+            pipeline=args.pipeline, archive=archive
+        )
+        logging.info(f"Streamed {thread_count} threads and {content_count} thread contents to {args.output}")
+        if scraper.watermark:
+            scraper.watermark.save()
+        return
+    
+    thread_contents = []
+    if args.content and args.pipeline:
+        # Scrape thread contents while later listing pages are still being fetched
+        threads = []
+        
+        def listed_threads():
+            for thread in scraper.iter_group_prefetched(max_pages=args.pages):
+                threads.append(thread)
+                yield thread
+        
+        group_threads = listed_threads()
+        thread_contents = scraper.scrape_thread_contents(group_threads, max_threads=args.threads)
+        # Finish paginating past the content limit so the thread list is complete
+        for _ in group_threads:
+            pass
+    else:
+        # Scrape threads
+        threads = scraper.scrape_group(max_pages=args.pages)
     
     if not threads:
+        if scraper.watermark:
+            scraper.watermark.save()
+            logging.info("No new or changed threads since the last sync.")
+            return
         logging.warning("No threads were found. The page structure might have changed or the group might be private.")
         return
         
     logging.info(f"Found {len(threads)} threads in total")
     
     # Scrape thread contents if requested
-    thread_contents = []
     if args.content:
-        thread_contents = scraper.scrape_thread_contents(threads, max_threads=args.threads)
+        if not args.pipeline:
+            thread_contents = scraper.scrape_thread_contents(threads, max_threads=args.threads)
         logging.info(f"Scraped content from {len(thread_contents)} threads")
     
+    if archive:
+        for thread_content in thread_contents:
+            archive.add_thread(thread_content, group_url=scraper.group_url)
+    
     # Save results or print to console
     if args.output:
         output_data = {
-            "group_url": args.group_url,
+            "group_url": scraper.group_url,
             "threads": threads
         }
         
@@ -357,6 +973,8 @@ def main():
             logging.info(f"Results saved to {args.output}")
         except Exception as e:
             logging.error(f"Failed to save results: {e}")
+            # Leave the watermark as it was, so the next sync scrapes these threads again
+            return
     else:
         # Print threads to console
         for i, thread in enumerate(threads, 1):
@@ -387,6 +1005,9 @@ def main():
                     print(f"  Content: {post['content'][:150]}...")
                     print()
                 print("-" * 50)
-        
+    
+    if scraper.watermark:
+        scraper.watermark.save()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Adaptive Selector Memoization
+
+The scraper tries several CSS selectors in order for each thing it extracts
+(thread list, post containers, post author/date/content, ...) because Google
+Groups serves different layouts. Within one group the layout rarely changes,
+so this module remembers which selector matched for each selector family and
+tries it first next time. The full list is only walked on a miss.
+
+Learned selectors are keyed by layout (the group URL) and can be persisted to
+a JSON file so later runs start warm.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+
+class SelectorMemo:
+    def __init__(self, path=None, layout_key="default"):
+        """
+        Args:
+            path: JSON file to load/save learned selectors (None to keep them in memory only)
+            layout_key: Key identifying the page layout, usually the group URL
+        """
+        self.path = Path(path) if path else None
+        self.layout_key = layout_key
+        self.learned = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+        # Per-thread seconds spent in match(), read back with take_match_time()
+        self._match_time = threading.local()
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.learned = json.load(f).get(layout_key, {})
+                if self.learned:
+                    logging.info(f"Loaded {len(self.learned)} learned selectors for {layout_key}")
+            except (OSError, ValueError) as e:
+                logging.warning(f"Failed to load selector memo {self.path}: {e}")
+
+    def _ordered(self, family, selectors):
+        learned = self.learned.get(family)
+        if learned in selectors:
+            return [learned] + [selector for selector in selectors if selector != learned]
+        return selectors
+
+    def match(self, root, family, selectors, select_one=False):
+        """
+        Return the first selector in the family that matches, trying the learned one first
+
+        Args:
+            root: Document or element to select from
+            family: Name of the selector family (e.g. "post", "post_author")
+            selectors: Candidate selectors in their default order
+            select_one: Use select_one instead of select
+
+        Returns:
+            tuple: (selector, match) or (None, None) if nothing matched
+        """
+        start_time = time.perf_counter()
+        ordered = self._ordered(family, selectors)
+        learned = ordered[0] if ordered is not selectors else None
+
+        try:
+            for attempts, selector in enumerate(ordered, 1):
+                match = root.select_one(selector) if select_one else root.select(selector)
+                if match:
+                    self._record(family, attempts, first_try=selector == learned, selector=selector)
+                    return selector, match
+
+            self._record(family, len(ordered), first_try=False)
+            return None, None
+        finally:
+            self._match_time.seconds = getattr(self._match_time, "seconds", 0.0) + time.perf_counter() - start_time
+
+    def take_match_time(self):
+        """Return the seconds the calling thread spent in match() since the last call, and reset it"""
+        seconds = getattr(self._match_time, "seconds", 0.0)
+        self._match_time.seconds = 0.0
+        return seconds
+
+    def _record(self, family, attempts, first_try, selector=None):
+        with self._lock:
+            stats = self.stats.setdefault(family, {"lookups": 0, "first_try": 0, "selects": 0})
+            stats["lookups"] += 1
+            stats["selects"] += attempts
+            if first_try:
+                stats["first_try"] += 1
+            if selector:
+                self.learned[family] = selector
+
+    def log_stats(self):
+        """Log per-family hit rates of the learned selector"""
+        with self._lock:
+            for family, stats in sorted(self.stats.items()):
+                hit_rate = 100.0 * stats["first_try"] / stats["lookups"]
+                logging.info(
+                    f"Selector '{family}': {stats['lookups']} lookups, {hit_rate:.0f}% hit learned selector, "
+                    f"{stats['selects'] / stats['lookups']:.2f} selects per lookup"
+                )
+
+    def save(self):
+        """Persist learned selectors, merging with other layouts already in the file"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = {}
+            data[self.layout_key] = dict(self.learned)
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+            except OSError as e:
+                logging.warning(f"Failed to save selector memo {self.path}: {e}")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Local Google Groups Stand-in Server
+
+Serves synthetic groups (see synthetic_pages.py) so concurrency and rate
+limiting can be tuned, and whole crawls timed, without touching Google.
+Pages are generated on request, so a 100k-thread group costs no memory.
+
+    /g/<group>              Listing page 1 (?page=N for later pages, with next-page links)
+    /g/<group>/c/<thread>   Thread page
+
+Every group has the same --threads threads (t0000000, t0000001, ...), each
+with a deterministic number of posts between --min-posts and --max-posts.
+--latency adds a delay to every response, and --throttle-rate answers that
+fraction of requests with 429 and a Retry-After header.
+
+Usage:
+    python standin_server.py [--port 8000] [--threads 100000] [--latency 0.05] [--throttle-rate 0.01]
+
+Example:
+    python standin_server.py --threads 100000 --latency 0.02 --throttle-rate 0.005
+    python generate_url_list.py https://groups.google.com/g/bench --base-url http://127.0.0.1:8000 --pages 1000
+    python batch_extractor.py thread_urls.txt --base-url http://127.0.0.1:8000 --rate 0 --metrics metrics.json
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from synthetic_pages import LAYOUTS, listing_page, thread_page
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+LISTING_PATH = re.compile(r"^/g/([^/]+)/?$")
+THREAD_PATH = re.compile(r"^/g/([^/]+)/c/t(\d+)(?:/.*)?$")
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive, like the real site
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # One line per request would drown out everything at load-test rates
+        pass
+
+    def do_GET(self):
+        config = self.server.config
+        if config.latency:
+            time.sleep(config.latency * random.uniform(1 - config.jitter, 1 + config.jitter))
+
+        if config.throttle_rate and random.random() < config.throttle_rate:
+            self.server.count("throttled")
+            self._send(429, "Too Many Requests", {"Retry-After": str(config.retry_after)})
+            return
+
+        url = urlparse(self.path)
+        listing = LISTING_PATH.match(url.path)
+        thread = THREAD_PATH.match(url.path)
+        if listing:
+            self._send_listing(listing.group(1), url.query)
+        elif thread and int(thread.group(2)) < config.threads:
+            self._send_thread(thread.group(1), int(thread.group(2)))
+        else:
+            self.server.count("not_found")
+            self._send(404, "Not Found")
+
+    def _send_listing(self, group, query):
+        config = self.server.config
+        try:
+            page = max(1, int(parse_qs(query).get("page", ["1"])[0]))
+        except ValueError:
+            page = 1
+        first = (page - 1) * config.per_page
+        last = min(first + config.per_page, config.threads)
+        thread_ids = [f"t{index:07d}" for index in range(first, last)]
+        next_href = f"/g/{group}?page={page + 1}" if last < config.threads else None
+        self.server.count("listings")
+        self._send(200, listing_page(f"/g/{group}", thread_ids, next_href, config.layout))
+
+    def _send_thread(self, group, index):
+        config = self.server.config
+        # Seeded per thread so every run serves identical pages
+        posts = random.Random(index).randint(config.min_posts, config.max_posts)
+        self.server.count("threads")
+        self._send(200, thread_page(f"t{index:07d}", posts, config.layout))
+
+    def _send(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super().__init__(address, StandinHandler)
+        self.config = config
+        self.counts = {"listings": 0, "threads": 0, "throttled": 0, "not_found": 0}
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def log_stats(self, elapsed):
+        with self._lock:
+            counts = dict(self.counts)
+        served = sum(counts.values())
+        logging.info(
+            f"Served {served} requests in {elapsed:.1f}s ({served / max(elapsed, 1e-9):.1f} req/s): "
+            f"{counts['listings']} listings, {counts['threads']} threads, "
+            f"{counts['throttled']} throttled, {counts['not_found']} not found"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Google Groups pages for local load testing")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--threads", type=int, default=1000, help="Threads in every group (default: 1000)")
+    parser.add_argument("--per-page", type=int, default=30, help="Threads per listing page (default: 30)")
+    parser.add_argument("--min-posts", type=int, default=1, help="Fewest posts in a thread (default: 1)")
+    parser.add_argument("--max-posts", type=int, default=20, help="Most posts in a thread (default: 20)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="new", help="Page markup to serve (default: new)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every response (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.5,
+                        help="Randomise latency by up to this fraction either way (default: 0.5)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with 429 Too Many Requests (default: 0)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s (default: 1)")
+    parser.add_argument("--seed", type=int, help="Seed latency and 429 injection for reproducible runs")
+
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    server = StandinServer((args.host, args.port), args)
+    logging.info(
+        f"Serving {args.threads} threads per group ({args.layout} layout) on http://{args.host}:{args.port}/g/<group>; "
+        f"latency {args.latency * 1000:.0f} ms, {args.throttle_rate:.1%} throttled"
+    )
+    start_time = time.monotonic()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.log_stats(time.monotonic() - start_time)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
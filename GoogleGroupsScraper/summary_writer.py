@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Streaming Summary Writer
+
+Writes batch_extractor.py's summary.json one thread at a time instead of
+holding every thread in memory until the end of the run.
+
+The document stays valid JSON after every write: the closing
+`], "thread_count": N}` trailer is written after each thread and cut off
+again (by truncating the file) before the next one is appended. Compressed
+output uses the same trick with one gzip member or zstd frame per write;
+concatenated members/frames are a valid stream for both formats.
+"""
+
+import gzip
+import json
+import textwrap
+
+try:
+    import zstandard
+except ImportError:
+    # Optional dependency
+    zstandard = None
+
+COMPRESSION_CHOICES = ["none", "gzip", "zstd"]
+_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def summary_filename(compression="none"):
+    """Return the summary file name for a compression format"""
+    return f"summary.json{_EXTENSIONS[compression]}"
+
+
+class StreamingSummaryWriter:
+    def __init__(self, path, compression="none"):
+        """
+        Args:
+            path: Output file path
+            compression: One of COMPRESSION_CHOICES
+        """
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires: pip install zstandard")
+        self.path = path
+        self.compression = compression
+        self.thread_count = 0
+        self._zstd = zstandard.ZstdCompressor() if compression == "zstd" else None
+        self._file = open(path, 'wb')
+        self._trailer_offset = 0
+        self._append('{\n  "threads": [')
+
+    def _encode(self, text):
+        data = text.encode('utf-8')
+        if self.compression == "gzip":
+            return gzip.compress(data)
+        if self.compression == "zstd":
+            return self._zstd.compress(data)
+        return data
+
+    def _append(self, text):
+        """Replace the trailer with text, then write a fresh trailer"""
+        self._file.seek(self._trailer_offset)
+        self._file.truncate()
+        self._file.write(self._encode(text))
+        self._trailer_offset = self._file.tell()
+        self._file.write(self._encode(f'\n  ],\n  "thread_count": {self.thread_count}\n}}\n'))
+        self._file.flush()
+
+    def add(self, thread):
+        """Append one thread to the summary"""
+        separator = "," if self.thread_count else ""
+        body = textwrap.indent(json.dumps(thread, indent=2, ensure_ascii=False), "    ")
+        self.thread_count += 1
+        self._append(f"{separator}\n{body}")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
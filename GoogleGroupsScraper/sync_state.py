@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Incremental Group Sync State
+
+Keeps a per-group watermark of the threads seen on earlier runs so nightly
+syncs only fetch what changed. Listing pages are newest-first, so once a
+page holds nothing new or changed, pagination can stop.
+
+A thread counts as changed when its listing title or date (the last
+activity shown in the listing) differs from what was recorded.
+
+When thread contents are fetched as well, a listed thread is only recorded
+once its content has been extracted (see confirm). Until then it is kept as
+pending, so threads that failed or were cut off by a thread limit are listed
+again by the next sync, and pagination doesn't stop before it has seen them.
+Pending threads survive between runs, which lets generate_url_list.py list
+threads and batch_extractor.py confirm them later.
+
+State file layout:
+    {
+        "<group_url>": {
+            "last_sync": "<ISO timestamp>",
+            "threads": {"<thread_id>": {"title": "...", "date": "..."}},
+            "pending": {"<thread_id>": {"title": "...", "date": "..."}}
+        }
+    }
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from thread_index import canonical_thread_id
+
+
+def group_key(group_url):
+    """Return the state file key for a group URL (without query string or trailing slash)"""
+    return group_url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+
+
+class SyncWatermark:
+    def __init__(self, path, group_url, require_content=False):
+        """
+        Args:
+            path: JSON state file shared by all groups (created on save)
+            group_url: Group whose watermark to load
+            require_content: Only record a thread once confirm() is called for it
+        """
+        self.path = path
+        self.group_url = group_key(group_url)
+        self.require_content = require_content
+        self.known = {}
+        # Listed threads waiting for their content, by thread ID
+        self.pending = {}
+        # Threads left pending by an earlier run that this run's listing hasn't reached yet
+        self.outstanding = set()
+        self.last_sync = None
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    groups = json.load(f)
+                state = groups.get(self.group_url) or groups.get(group_url, {})
+                self.known = state.get("threads", {})
+                self.pending = state.get("pending", {})
+                self.outstanding = set(self.pending)
+                self.last_sync = state.get("last_sync")
+            except (OSError, ValueError) as e:
+                logging.warning(f"Failed to load sync state {path}: {e}")
+
+        if self.last_sync:
+            logging.info(f"Incremental sync: {len(self.known)} known threads, {len(self.pending)} pending, "
+                         f"last synced {self.last_sync}")
+        else:
+            logging.info("Incremental sync: no previous state for this group, doing a full sync")
+
+    def observe(self, threads):
+        """
+        Record threads from one listing page
+
+        Args:
+            threads: Thread dictionaries from extract_thread_info
+
+        Returns:
+            list: Threads that are new or changed since the last sync
+        """
+        fresh = []
+        for thread in threads:
+            thread_id = self._thread_id(thread.get("link")) or thread["title"]
+            self.outstanding.discard(thread_id)
+            record = {"title": thread["title"], "date": thread.get("date")}
+            previous = self.known.get(thread_id)
+            if previous is None:
+                self.new += 1
+            elif previous != record:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+                continue
+            if self.require_content:
+                self.pending[thread_id] = record
+            else:
+                self.known[thread_id] = record
+            fresh.append(thread)
+        return fresh
+
+    def can_stop(self, threads, fresh):
+        """Return True if pagination can stop after a page that listed threads and yielded fresh"""
+        return bool(threads) and not fresh and not self.outstanding
+
+    def listing_complete(self):
+        """Forget pending threads the full listing no longer shows (deleted threads)"""
+        for thread_id in self.outstanding:
+            self.pending.pop(thread_id, None)
+        self.outstanding.clear()
+
+    def confirm(self, thread_url):
+        """Record a listed thread once its content has been extracted"""
+        thread_id = self._thread_id(thread_url)
+        record = self.pending.pop(thread_id, None)
+        self.outstanding.discard(thread_id)
+        if record is not None:
+            self.known[thread_id] = record
+
+    @staticmethod
+    def _thread_id(link):
+        return canonical_thread_id(link) or link
+
+    def log_stats(self):
+        logging.info(f"Incremental sync: {self.new} new, {self.changed} changed, {self.unchanged} unchanged threads")
+        if self.pending:
+            logging.info(f"Incremental sync: {len(self.pending)} listed threads have no content yet "
+                         "and will be listed again on the next sync")
+
+    def save(self):
+        """Write this group's watermark back to the state file, keeping other groups"""
+        state = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+        state[self.group_url] = {
+            "last_sync": datetime.now(timezone.utc).isoformat(),
+            "threads": self.known,
+            "pending": self.pending,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
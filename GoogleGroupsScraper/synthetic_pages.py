@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Synthetic Google Groups Pages
+
+Builds listing and thread pages in the markup the scraper's selectors
+understand, for offline benchmarks and local load testing. Two layouts are
+available:
+
+    old  .thread-title / div.post / .author / .date / .content
+    new  Google's obfuscated class names (div.EGkKVb, .UXbBWb, .tlFcqe, ...)
+
+Text is generated from a seeded RNG, so the same arguments always produce
+the same bytes. in_chrome moves a generated page into the markup of a saved
+real page (page_source.html), for a listing page with real-sized head,
+inline CSS and scripts around the rows.
+"""
+
+import html
+import random
+import re
+
+LAYOUTS = ("old", "new")
+
+_WORDS = (
+    "the a to of and in is it that for on with as this was be are at by not "
+    "error install version python build release config server client request "
+    "thread group message reply update issue problem solution works fails "
+    "linux windows mac docs example question answer thanks please help"
+).split()
+
+
+def _sentence(rng, min_words=6, max_words=18):
+    words = rng.choices(_WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng, count):
+    return [" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+
+def thread_title(thread_id):
+    """Return the deterministic title of a synthetic thread"""
+    rng = random.Random(f"title:{thread_id}")
+    return _sentence(rng, 3, 8).rstrip(".")
+
+
+def _document(title, body):
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)} - Google Groups</title></head>\n"
+        f"<body>\n{body}\n</body></html>\n"
+    )
+
+
+def listing_page(group_path, thread_ids, next_href=None, layout="old"):
+    """
+    Build a group listing page
+
+    Args:
+        group_path: Group path, e.g. "/g/groupname"
+        thread_ids: IDs of the threads listed on this page
+        next_href: Link to the next listing page, or None on the last page
+        layout: One of LAYOUTS
+
+    Returns:
+        str: HTML document
+    """
+    rows = []
+    for thread_id in thread_ids:
+        rng = random.Random(f"listing:{thread_id}")
+        href = html.escape(f"{group_path}/c/{thread_id}")
+        title = html.escape(thread_title(thread_id))
+        author = f"user{rng.randint(1, 500)}"
+        date = f"Jan {rng.randint(1, 28)}, 20{rng.randint(10, 24)}"
+        if layout == "old":
+            rows.append(
+                f'<div class="thread"><a class="thread-title" href="{href}">{title}</a>'
+                f'<span class="author">{author}</span><span class="date">{date}</span></div>'
+            )
+        else:
+            rows.append(
+                f'<div role="row" class="yhgbKd"><a class="ZLl54" href="{href}">{title}</a>'
+                f'<span class="bZI0O">{author}</span><span class="wJMDsd">{date}</span></div>'
+            )
+    if next_href:
+        link_class = "next-page-link" if layout == "old" else "ZIKj2d"
+        rows.append(f'<a class="{link_class}" href="{html.escape(next_href)}">Next</a>')
+    name = group_path.rstrip("/").rsplit("/", 1)[-1]
+    return _document(name, "\n".join(rows))
+
+
+def thread_page(thread_id, posts, layout="old"):
+    """
+    Build a thread page
+
+    Args:
+        thread_id: Thread ID (seeds the generated text)
+        posts: Number of posts in the thread
+        layout: One of LAYOUTS
+
+    Returns:
+        str: HTML document
+    """
+    rng = random.Random(f"thread:{thread_id}")
+    title = html.escape(thread_title(thread_id))
+    if layout == "old":
+        parts = [f'<h1 class="thread-title">{title}</h1>']
+        post_tag, author_class, date_class, content_class = "post", "author", "date", "content"
+    else:
+        parts = [f'<h1 class="iUvsJ">{title}</h1>']
+        post_tag, author_class, date_class, content_class = "EGkKVb", "UXbBWb", "ZRWfre", "tlFcqe"
+
+    for _ in range(posts):
+        author = f"user{rng.randint(1, 500)}"
+        date = f"Jan {rng.randint(1, 28)}, 20{rng.randint(10, 24)}, {rng.randint(1, 12)}:{rng.randint(0, 59):02d} PM"
+        body = "\n".join(f"<p>{html.escape(text)}</p>" for text in _paragraphs(rng, rng.randint(1, 4)))
+        parts.append(
+            f'<div class="{post_tag}"><span class="{author_class}">{author}</span>'
+            f'<span class="{date_class}">{date}</span>\n<div class="{content_class}">\n{body}\n</div></div>'
+        )
+    return _document(thread_title(thread_id), "\n".join(parts))
+
+
+def in_chrome(page, chrome):
+    """
+    Insert a generated page's body at the start of a saved real page's <body>
+
+    Args:
+        page: HTML document from listing_page or thread_page
+        chrome: HTML of a saved Google Groups page
+
+    Returns:
+        str: HTML document
+    """
+    body = page[page.index("<body>") + len("<body>"):page.rindex("</body>")]
+    start = re.search(r"<body\b[^>]*>", chrome, re.IGNORECASE).end()
+    return chrome[:start] + body + chrome[start:]
@@ -16,7 +16,8 @@ import argparse
 import json
 import logging
 import sys
-from scraper import GoogleGroupsScraper
+from scraper import (GoogleGroupsScraper, add_cache_arguments, add_metrics_argument, add_parser_argument,
+                     add_rate_arguments, cache_from_args, metrics_from_args, rate_limiter_from_args)
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +31,10 @@ def main():
     parser.add_argument("thread_url", help="URL of the Google Groups thread to extract")
     parser.add_argument("--cookies", help="Path to JSON file with authentication cookies (for private groups)")
     parser.add_argument("--output", help="Path to save the results as JSON")
+    add_cache_arguments(parser)
+    add_parser_argument(parser)
+    add_rate_arguments(parser)
+    add_metrics_argument(parser)
     
     args = parser.parse_args()
     
@@ -44,7 +49,10 @@ def main():
     logging.info(f"Extracted group URL: {group_url}")
     
     # Initialize the scraper with the group URL
-    scraper = GoogleGroupsScraper(group_url)
+    cache = cache_from_args(args)
+    scraper = GoogleGroupsScraper(group_url, cache=cache, parser=args.parser,
+                                  selector_cache=args.selector_cache, rate_limiter=rate_limiter_from_args(args),
+                                  metrics=metrics_from_args(args))
     
     # Authenticate with cookies if provided
     if args.cookies:
@@ -56,6 +64,8 @@ def main():
     logging.info(f"Extracting content from thread: {args.thread_url}")
     thread_content = scraper.extract_thread_content(args.thread_url)
     
+    scraper.log_run_stats()
+    
     if not thread_content:
         logging.error("Failed to extract content from the thread.")
         return 1
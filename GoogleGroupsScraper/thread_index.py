@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Canonical Thread Index
+
+Listing pages often link to the same thread several times (the title, the
+snippet, the "last post" link, ...), sometimes as /m/<message> links or with
+query strings. Every duplicate would cost a full thread fetch downstream, so
+links are reduced to a canonical thread ID and checked against an index of
+IDs already seen.
+
+    https://groups.google.com/g/grp/c/AbC123?hl=en        -> AbC123
+    https://groups.google.com/g/grp/c/AbC123/m/XyZ789     -> AbC123
+    /a/example.com/g/grp/c/AbC123#anchor                  -> AbC123
+"""
+
+import logging
+from urllib.parse import urlparse
+
+
+def canonical_thread_id(link):
+    """
+    Return the canonical thread ID for a thread or message link
+
+    Args:
+        link: Absolute or relative Google Groups URL
+
+    Returns:
+        str: Thread ID, or None if the link is not a /c/<id> thread link
+    """
+    if not link:
+        return None
+    segments = [segment for segment in urlparse(link).path.split("/") if segment]
+    # The c that follows g/<group>, so a group (or Workspace domain) named "c" or "g" doesn't shift it
+    for index, segment in enumerate(segments[:-3]):
+        if segment == "g" and segments[index + 2] == "c":
+            return segments[index + 3]
+    # Without a g/<group> prefix: the last c, before an optional m/<message id>
+    if len(segments) >= 4 and segments[-4] == "c" and segments[-2] == "m":
+        return segments[-3]
+    if len(segments) >= 2 and segments[-2] == "c":
+        return segments[-1]
+    return None
+
+
+class ThreadIndex:
+    def __init__(self):
+        self.seen = set()
+        self.duplicates = 0
+
+    def add(self, link):
+        """
+        Record a link
+
+        Returns:
+            bool: False if the link's thread was already seen, True otherwise
+                (including links that are not thread links)
+        """
+        thread_id = canonical_thread_id(link)
+        if thread_id is None:
+            return True
+        if thread_id in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(thread_id)
+        return True
+
+    def log_stats(self):
+        if self.duplicates:
+            logging.info(f"Thread index: skipped {self.duplicates} duplicate thread links ({self.duplicates} fetches avoided)")